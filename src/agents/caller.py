@@ -5,6 +5,7 @@ Subagent 调用接口
 通过 SDK 直接执行，失败时抛出异常。
 """
 
+import asyncio
 import logging
 from typing import Any, Optional
 
@@ -28,13 +29,22 @@ class SubagentCaller:
         self.pool = pool or get_pool()
         self.executor = executor or get_executor()
 
-    async def call(self, agent_id: str, context: dict[str, Any]) -> dict[str, Any]:
+    async def call(
+        self,
+        agent_id: str,
+        context: dict[str, Any],
+        *,
+        timeout: Optional[float] = None,
+        max_retries: int = 0,
+    ) -> dict[str, Any]:
         """
         调用 subagent 执行任务
 
         Args:
             agent_id: 要调用的 subagent ID
             context: 传递给 subagent 的上下文
+            timeout: 单次调用超时（秒），None 表示不限
+            max_retries: 失败/超时后的最大重试次数
 
         Returns:
             执行结果
@@ -83,15 +93,27 @@ class SubagentCaller:
         # 标记为使用中
         self.manager.mark_in_use(agent_id)
 
-        try:
-            # 使用 SDK 执行器执行
-            result: SubagentResult = await self.executor.execute(
-                agent_id=agent_id,
-                system_prompt=system_prompt,
-                context=context,
-                tools=template.tools or ["Read", "Write", "Edit", "Bash", "Glob", "Grep"],
-                model=template.model,
-            )
+        error = None
+        for attempt in range(max(0, max_retries) + 1):
+            try:
+                # 使用 SDK 执行器执行
+                result: SubagentResult = await asyncio.wait_for(
+                    self.executor.execute(
+                        agent_id=agent_id,
+                        system_prompt=system_prompt,
+                        context=context,
+                        tools=template.tools or ["Read", "Write", "Edit", "Bash", "Glob", "Grep"],
+                        model=template.model,
+                    ),
+                    timeout=timeout,
+                )
+            except asyncio.TimeoutError:
+                error = f"Subagent {agent_id} 调用超时（{timeout}s）"
+                logger.warning("Subagent call timed out: agent_id=%s attempt=%d", agent_id, attempt + 1)
+                continue
+            except Exception as e:
+                error = str(e)
+                continue
 
             if result.success:
                 return {
@@ -101,20 +123,14 @@ class SubagentCaller:
                     "result": result.result,
                     "turns": result.turns,
                 }
-            else:
-                # 直接返回错误，不降级
-                return {
-                    "success": False,
-                    "error": result.error,
-                    "result": None
-                }
+            # 直接返回错误，不降级（仍允许按 max_retries 重试）
+            error = result.error
 
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
-                "result": None
-            }
+        return {
+            "success": False,
+            "error": error,
+            "result": None
+        }
 
     async def call_planner(self, task: str, time_budget: dict = None) -> dict:
         """调用 planner subagent 进行任务分解"""
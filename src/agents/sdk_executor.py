@@ -224,22 +224,22 @@ class SDKExecutor:
             if result_message_content:
                 final_result = result_message_content
             elif result_data:
-                final_result = “\n”.join(result_data)
+                final_result = "\n".join(result_data)
             else:
                 # 从 messages 中找最后一条有实际内容的
                 final_result = None
                 for msg in reversed(messages):
-                    if msg.get(“type”) == “ResultMessage”:
-                        v = msg.get(“result”) or msg.get(“raw_result”)
+                    if msg.get("type") == "ResultMessage":
+                        v = msg.get("result") or msg.get("raw_result")
                         if v and str(v).strip():
                             final_result = str(v).strip()
                             break
                     else:
-                        v = msg.get(“content”)
-                        if v and str(v).strip() and not str(v).startswith(“{'type':”):
+                        v = msg.get("content")
+                        if v and str(v).strip() and not str(v).startswith("{'type':"):
                             final_result = str(v).strip()
                             break
-                _log.warning(“All result sources empty for agent=%s turns=%d”, agent_id, turns)
+                _log.warning("All result sources empty for agent=%s turns=%d", agent_id, turns)
 
             # 若没有任何可用结果，视为执行失败（避免上层误判为”秒完成”）
             if not final_result or not str(final_result).strip():
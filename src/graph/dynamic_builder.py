@@ -18,6 +18,7 @@ class DynamicGraphBuilder:
         self._edges: dict[str, DynamicEdge] = {}
         self._node_executors: dict[str, Callable[[GraphState], Awaitable[dict]]] = {}
         self._compiled_graph = None
+        self._dict_cache: dict | None = None  # to_dict() 结果缓存，图结构或节点状态变化时失效
         self._checkpointer = MemorySaver()
 
     # ── 节点管理 ──
@@ -49,6 +50,7 @@ class DynamicGraphBuilder:
         self._nodes[node_id] = node
         self._node_executors[node_id] = executor
         self._compiled_graph = None  # 使缓存失效
+        self._dict_cache = None
 
         return node
 
@@ -78,6 +80,7 @@ class DynamicGraphBuilder:
         del self._nodes[node_id]
         del self._node_executors[node_id]
         self._compiled_graph = None
+        self._dict_cache = None
 
         return True
 
@@ -98,6 +101,7 @@ class DynamicGraphBuilder:
         node = self._nodes.get(node_id)
         if node:
             node.status = status
+            self._dict_cache = None
             return True
         return False
 
@@ -133,6 +137,7 @@ class DynamicGraphBuilder:
 
         self._edges[edge.id] = edge
         self._compiled_graph = None
+        self._dict_cache = None
 
         return edge
 
@@ -157,12 +162,14 @@ class DynamicGraphBuilder:
             "condition_func": condition_func,
         }
         self._compiled_graph = None
+        self._dict_cache = None
 
     def remove_edge(self, edge_id: str) -> bool:
         """移除边"""
         if edge_id in self._edges:
             del self._edges[edge_id]
             self._compiled_graph = None
+            self._dict_cache = None
             return True
         return False
 
@@ -250,7 +257,15 @@ class DynamicGraphBuilder:
         return "\n".join(lines)
 
     def to_dict(self) -> dict:
-        """导出为字典（用于 API 响应）"""
+        """导出为字典（用于 API 响应）
+
+        结果会被缓存并在多次调用间共享，调用方不要修改返回值。
+        """
+        if self._dict_cache is None:
+            self._dict_cache = self._build_dict()
+        return self._dict_cache
+
+    def _build_dict(self) -> dict:
         return {
             "nodes": [
                 {
@@ -1,6 +1,6 @@
 """src/graph/edges.py — 条件路由函数"""
 import logging
-from src.graph.state import GraphState
+from src.graph.state import GraphState, TERMINAL_STATUSES
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +28,7 @@ def route_after_router(state: GraphState) -> str:
         return "executing"
     if phase == "reviewing":
         current = _get_current(state)
-        if current is not None and current.status not in ("done", "failed", "skipped"):
+        if current is not None and current.status not in TERMINAL_STATUSES:
             return "reviewing"
         if _all_terminal(subtasks):
             return "complete"
@@ -43,7 +43,7 @@ def route_after_router(state: GraphState) -> str:
     # 检查任务完成状态
     if not subtasks:
         return "planning"
-    if all(t.status in ("done", "skipped", "failed") for t in subtasks):
+    if all(t.status in TERMINAL_STATUSES for t in subtasks):
         return "complete"
 
     return "executing"
@@ -96,7 +96,7 @@ def should_continue_or_timeout(state: GraphState) -> str:
 
 # ── 工具函数 ──
 def _all_terminal(subtasks: list) -> bool:
-    return bool(subtasks) and all(t.status in ("done", "skipped", "failed") for t in subtasks)
+    return bool(subtasks) and all(t.status in TERMINAL_STATUSES for t in subtasks)
 
 
 def _get_current(state: GraphState):
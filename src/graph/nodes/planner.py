@@ -1,12 +1,16 @@
 """src/graph/nodes/planner.py — 任务分解节点"""
 import asyncio
 import json
+import logging
 from collections import defaultdict, deque
 from datetime import datetime
 
 from src.graph.state import GraphState, SubTask, ExecutionPolicy
 from src.utils.config import get_config
 from src.agents.caller import get_caller
+from src.graph.utils.subtask_index import build_subtask_index
+
+logger = logging.getLogger(__name__)
 
 PLANNER_SYSTEM_PROMPT = """
 你是一个任务规划专家。你的职责是将用户任务分解为用于“系统自检→缺陷修复→修复验证”的复杂子任务图（DAG+条件回环）。
@@ -239,9 +243,8 @@ async def planner_node(state: GraphState) -> dict:
     try:
         call_result = await caller.call_planner(task=planner_task, time_budget=time_budget_info)
     except Exception as _pe:
-        import logging as _logging
         planner_call_error = f"planner_call_failed: {_pe}"
-        _logging.getLogger(__name__).warning("[planner] %s", planner_call_error)
+        logger.warning("[planner] %s", planner_call_error)
         call_result = {"success": False, "error": planner_call_error}
 
     if not call_result.get("success") and not planner_call_error:
@@ -260,9 +263,8 @@ async def planner_node(state: GraphState) -> dict:
             subtasks = _normalize_domains(subtasks, max(1, policy.min_agents_per_node))
             ok, reason = _validate_subtasks(subtasks, policy)
             if not ok and policy.strict_enforcement:
-                import logging as _logging
                 fallback_reason = f"planner_output_invalid:{reason}"
-                _logging.getLogger(__name__).warning(
+                logger.warning(
                     "[planner] strict validation failed after subagent output (%s), fallback to local template",
                     reason,
                 )
@@ -436,6 +438,7 @@ async def planner_node(state: GraphState) -> dict:
 
     return {
         "subtasks": subtasks,
+        "subtask_index": build_subtask_index(subtasks),
         "phase": "budgeting",
         "execution_log": [planning_meta],
     }
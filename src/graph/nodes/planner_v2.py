@@ -15,6 +15,7 @@ from typing import Optional
 from src.graph.state import GraphState, SubTask
 from src.agents.caller import get_caller
 from src.discussion.manager import discussion_manager
+from src.graph.utils.subtask_index import build_subtask_index
 
 
 # 多规划专家数量
@@ -64,6 +65,7 @@ async def planner_v2_node(state: GraphState) -> dict:
 
     return {
         "subtasks": final_subtasks,
+        "subtask_index": build_subtask_index(final_subtasks),
         "phase": "budgeting",
         "execution_log": [{
             "event": "multi_planning_complete",
@@ -355,6 +357,7 @@ def _create_fallback_result(state: GraphState, user_task: str, budget) -> dict:
 
     return {
         "subtasks": subtasks,
+        "subtask_index": build_subtask_index(subtasks),
         "phase": "budgeting",
         "execution_log": [{
             "event": "planning_fallback",
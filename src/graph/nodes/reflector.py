@@ -7,6 +7,7 @@ from src.graph.state import GraphState, SubTask
 from src.agents.caller import get_caller
 from src.agents.pool_registry import get_pool
 from src.graph.utils.json_parser import extract_first_json_object
+from src.graph.utils.subtask_index import build_subtask_index, find_subtask, replace_subtask
 
 logger = logging.getLogger(__name__)
 
@@ -25,7 +26,7 @@ async def reflector_node(state: GraphState) -> dict:
     subtasks = state.get("subtasks", [])
     cid = state.get("current_subtask_id")
 
-    current = _find_current_subtask(subtasks, cid)
+    current = _find_current_subtask(subtasks, cid, state.get("subtask_index"))
     if not current:
         return {"phase": "executing"}
 
@@ -64,22 +65,22 @@ async def reflector_node(state: GraphState) -> dict:
         + reflection
     )
 
-    updated_subtasks = []
-    for t in subtasks:
-        if t.id == current.id:
-            updated_subtasks.append(t.model_copy(update={
-                "description": new_description,
-                "status": "pending",
-                "result": None,
-            }))
-        else:
-            updated_subtasks.append(t)
+    updated_subtasks = replace_subtask(
+        subtasks,
+        current.model_copy(update={
+            "description": new_description,
+            "status": "pending",
+            "result": None,
+        }),
+        state.get("subtask_index"),
+    )
 
     # 同步更新专家 subagent 的 system_prompt，使其从失败中学习
     _update_specialist_prompts(current, reflection)
 
     return {
         "subtasks": updated_subtasks,
+        "subtask_index": build_subtask_index(updated_subtasks),
         "phase": "executing",
         "execution_log": [{
             "event": "reflection_complete",
@@ -91,9 +92,13 @@ async def reflector_node(state: GraphState) -> dict:
     }
 
 
-def _find_current_subtask(subtasks: list[SubTask], cid: Optional[str]) -> Optional[SubTask]:
-    """查找当前子任务"""
-    return next((t for t in subtasks if t.id == cid), None)
+def _find_current_subtask(
+    subtasks: list[SubTask],
+    cid: Optional[str],
+    index: Optional[dict[str, int]] = None,
+) -> Optional[SubTask]:
+    """查找当前子任务（优先使用 state 中的 subtask_index）"""
+    return find_subtask(subtasks, cid, index)
 
 
 def _get_last_review(state: GraphState, task_id: str) -> Optional[dict]:
@@ -10,45 +10,64 @@ Reflector V2 — 多角度反思节点
 import asyncio
 import json
 from datetime import datetime
+from types import MappingProxyType
 from typing import Optional
 
 from src.graph.state import GraphState, SubTask
 from src.agents.caller import get_caller
+from src.agents.pool_registry import get_pool
 from src.discussion.manager import discussion_manager
+from src.graph.utils.subtask_index import build_subtask_index, find_subtask, replace_subtask
 
 
-# 反思视角定义
-REFLECTION_PERSPECTIVES = {
+# 单个视角反思调用的上限：
+# - 超时 = 子任务自身的预估时长（budget 节点已按总预算缩放），反思不应比任务本身更久；
+#   超时的视角只会被丢弃（全部失败时走简单改进），不会让失败任务被判通过
+# - 失败/超时后重试一次，避免瞬态错误直接丢掉一个视角
+REFLECTION_MIN_TIMEOUT_MINUTES = 1.0
+REFLECTION_MAX_RETRIES = 1
+
+# 反思视角定义（只读：questions 用 tuple，顶层用 MappingProxyType）
+REFLECTION_PERSPECTIVES = MappingProxyType({
     "technical": {
         "name": "技术反思者",
         "focus": "代码质量、架构合理性、技术选型",
-        "questions": [
+        "questions": (
             "代码是否存在明显 bug 或逻辑错误？",
             "架构设计是否合理？",
             "是否使用了正确的技术方案？",
             "是否有性能或安全问题？",
-        ],
+        ),
     },
     "process": {
         "name": "流程反思者",
         "focus": "执行步骤、时间分配、依赖管理",
-        "questions": [
+        "questions": (
             "执行步骤是否遗漏或顺序错误？",
             "时间分配是否合理？",
             "依赖任务是否正确完成？",
             "是否缺少必要的验证步骤？",
-        ],
+        ),
     },
     "resource": {
         "name": "资源反思者",
         "focus": "信息充分性、工具可用性、环境配置",
-        "questions": [
+        "questions": (
             "是否有足够的信息完成任务？",
             "工具和环境是否正确配置？",
             "是否缺少必要的依赖或资源？",
             "文档和参考资料是否充分？",
-        ],
+        ),
     },
+})
+
+# 视角 -> 展示名称（模块加载时预计算，避免逐条消息的嵌套 dict 查找）
+_PERSPECTIVE_NAMES = {p: c["name"] for p, c in REFLECTION_PERSPECTIVES.items()}
+
+# 视角 -> 传给 subagent 的 perspective 上下文（静态数据，模块加载时构建一次）
+_PERSPECTIVE_CTX = {
+    p: {"name": c["name"], "focus": c["focus"], "questions": c["questions"]}
+    for p, c in REFLECTION_PERSPECTIVES.items()
 }
 
 
@@ -57,6 +76,7 @@ async def reflector_v2_node(state: GraphState) -> dict:
     多角度反思节点
 
     流程:
+    0. 审查未给出任何问题时跳过多视角反思，直接简单改进
     1. 从技术、流程、资源三个角度并行分析
     2. 在 DiscussionManager 中讨论
     3. 共识形成综合改进方案
@@ -65,7 +85,7 @@ async def reflector_v2_node(state: GraphState) -> dict:
     subtasks = state.get("subtasks", [])
     cid = state.get("current_subtask_id")
 
-    current = _find_current_subtask(subtasks, cid)
+    current = _find_current_subtask(subtasks, cid, state.get("subtask_index"))
     if not current:
         return {"phase": "executing"}
 
@@ -73,6 +93,12 @@ async def reflector_v2_node(state: GraphState) -> dict:
     last_review = _get_last_review(state, current.id)
     issues = last_review.get("issues", []) if last_review else []
 
+    # 没有可分析的问题时，多视角 LLM 反思没有输入，直接走简单改进
+    if not issues:
+        return _create_simple_improvement(
+            state, current, issues, event="reflection_skipped_no_issues"
+        )
+
     # === 阶段1: 多角度并行反思 ===
     reflections = await _parallel_reflection(caller, current, issues)
 
@@ -81,7 +107,9 @@ async def reflector_v2_node(state: GraphState) -> dict:
         return _create_simple_improvement(state, current, issues)
 
     # === 阶段2: 讨论协商 ===
-    discussion_id = f"reflection_{current.id}_{datetime.now().strftime('%H%M%S')}"
+    # 本次调用只取一次时钟：discussion_id 与日志时间戳共用
+    now = datetime.now()
+    discussion_id = f"reflection_{current.id}_{now.strftime('%H%M%S')}"
 
     await _submit_reflections_for_discussion(discussion_id, reflections, current)
 
@@ -98,21 +126,21 @@ async def reflector_v2_node(state: GraphState) -> dict:
         + improvement
     )
 
-    updated_subtasks = []
-    for t in subtasks:
-        if t.id == current.id:
-            updated_subtasks.append(t.model_copy(update={
-                "description": new_description,
-                "status": "pending",
-                "result": None,
-            }))
-        else:
-            updated_subtasks.append(t)
+    updated_subtasks = replace_subtask(
+        subtasks,
+        current.model_copy(update={
+            "description": new_description,
+            "status": "pending",
+            "result": None,
+        }),
+        state.get("subtask_index"),
+    )
 
     # 保持 task/session 作用域，不再写回全局专家模板
 
     return {
         "subtasks": updated_subtasks,
+        "subtask_index": build_subtask_index(updated_subtasks),
         "phase": "executing",
         "execution_log": [{
             "event": "multi_reflection_complete",
@@ -121,7 +149,7 @@ async def reflector_v2_node(state: GraphState) -> dict:
             "perspectives_used": list(reflections.keys()),
             "discussion_id": discussion_id,
             "consensus_reached": consensus.get("status") == "consensus_reached",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
         }],
     }
 
@@ -137,50 +165,54 @@ async def _parallel_reflection(
     Returns:
         视角 -> 反思结果的映射
     """
-    async def reflect_from_perspective(perspective: str, config: dict) -> Optional[dict]:
+    call_timeout = max(task.estimated_minutes, REFLECTION_MIN_TIMEOUT_MINUTES) * 60
+
+    # 各视角共享同一份失败上下文与子任务信息（只读），仅 perspective 不同
+    failure_ctx = {
+        "issues": issues,
+        "original_description": task.description,
+        "retry_count": task.retry_count,
+        "last_result": task.result,
+    }
+    subtask_ctx = {
+        "id": task.id,
+        "title": task.title,
+        "description": task.description,
+        "agent_type": task.agent_type,
+    }
+
+    # 模板池每次反思只取一次，供各视角共用
+    get_template = get_pool().get_template
+
+    async def reflect_from_perspective(perspective: str) -> Optional[dict]:
         # 构建视角专属提示
         context = {
-            "failure_context": {
-                "issues": issues,
-                "original_description": task.description,
-                "retry_count": task.retry_count,
-                "last_result": task.result,
-            },
-            "subtask": {
-                "id": task.id,
-                "title": task.title,
-                "description": task.description,
-                "agent_type": task.agent_type,
-            },
-            "perspective": {
-                "name": config["name"],
-                "focus": config["focus"],
-                "questions": config["questions"],
-            },
+            "failure_context": failure_ctx,
+            "subtask": subtask_ctx,
+            "perspective": _PERSPECTIVE_CTX[perspective],
         }
 
         # 尝试使用视角专属的 reflector
         perspective_agent = f"reflector_{perspective}"
-        from src.agents.pool_registry import get_pool
-        pool = get_pool()
-
-        if pool.get_template(perspective_agent):
+        if get_template(perspective_agent):
             agent_id = perspective_agent
         else:
             agent_id = "reflector"  # 降级为通用 reflector
 
-        result = await caller.call(agent_id, context)
+        result = await caller.call(
+            agent_id,
+            context,
+            timeout=call_timeout,
+            max_retries=REFLECTION_MAX_RETRIES,
+        )
         if result.get("success"):
             return _parse_reflection_result(result.get("result"))
         return None
 
     # 并行执行三个视角的反思
-    tasks = [
-        reflect_from_perspective(p, c)
-        for p, c in REFLECTION_PERSPECTIVES.items()
-    ]
+    tasks = [reflect_from_perspective(p) for p in REFLECTION_PERSPECTIVES]
 
-    # 超时已禁用：让任务自然完成
+    # 整体不设超时：每个视角调用已按子任务预估时长单独限时
     results = await asyncio.gather(*tasks)
 
     # 组织结果
@@ -233,21 +265,29 @@ async def _submit_reflections_for_discussion(
     """
     discussion_manager.create_discussion(discussion_id)
 
-    for perspective, reflection in reflections.items():
-        config = REFLECTION_PERSPECTIVES.get(perspective, {})
-        agent_name = config.get("name", perspective)
-
-        await discussion_manager.post_message(
-            node_id=discussion_id,
-            from_agent=f"reflector_{perspective}",
-            content=json.dumps({
-                "perspective": agent_name,
+    # 先在循环外完成序列化，再并发投递各视角消息
+    payloads = [
+        (
+            f"reflector_{perspective}",
+            json.dumps({
+                "perspective": _PERSPECTIVE_NAMES.get(perspective, perspective),
                 "root_cause": reflection.get("root_cause"),
                 "lessons": reflection.get("lessons_learned", [])[:3],
                 "suggested_improvement": reflection.get("improved_description", "")[:200],
             }, ensure_ascii=False),
+        )
+        for perspective, reflection in reflections.items()
+    ]
+
+    await asyncio.gather(*[
+        discussion_manager.post_message(
+            node_id=discussion_id,
+            from_agent=from_agent,
+            content=content,
             message_type="reflection",
         )
+        for from_agent, content in payloads
+    ])
 
     # 请求共识
     await discussion_manager.request_consensus(
@@ -266,16 +306,19 @@ async def _wait_for_consensus(discussion_id: str) -> dict:
 
     # 模拟共识达成（实际应通过多轮讨论）
     # 让各参与者确认共识
-    participants = list(set(m.from_agent for m in discussion.messages))
+    participants = list(dict.fromkeys(m.from_agent for m in discussion.messages))
 
-    for participant in participants:
-        try:
-            await discussion_manager.confirm_consensus(
+    # 并发确认；return_exceptions=True 忽略个别确认失败
+    await asyncio.gather(
+        *[
+            discussion_manager.confirm_consensus(
                 node_id=discussion_id,
                 from_agent=participant,
             )
-        except Exception:
-            pass  # 忽略确认失败
+            for participant in participants
+        ],
+        return_exceptions=True,
+    )
 
     return {
         "status": "consensus_reached",
@@ -294,42 +337,34 @@ def _synthesize_improvement(
     将各视角的反思合并为完整的改进描述
     """
     parts = []
-
-    # 收集所有根本原因
     root_causes = []
+    all_lessons = []
+    all_measures = []
+    best_improvement = ""
+    best_length = 0
+
+    # 单次遍历收集根本原因 / 经验教训 / 预防措施，并同步选出最佳改进描述
     for perspective, reflection in reflections.items():
         rc = reflection.get("root_cause")
         if rc:
-            config = REFLECTION_PERSPECTIVES.get(perspective, {})
-            root_causes.append(f"[{config.get('name', perspective)}] {rc}")
+            root_causes.append(f"- [{_PERSPECTIVE_NAMES.get(perspective, perspective)}] {rc}")
+        if len(all_lessons) < 5:
+            all_lessons.extend(reflection.get("lessons_learned", [])[:5 - len(all_lessons)])
+        if len(all_measures) < 5:
+            all_measures.extend(reflection.get("prevention_measures", [])[:5 - len(all_measures)])
+        imp = reflection.get("improved_description", "")
+        if len(imp) > best_length:
+            best_improvement = imp
+            best_length = len(imp)
 
     if root_causes:
-        parts.append("## 根本原因分析\n" + "\n".join(f"- {rc}" for rc in root_causes))
-
-    # 收集所有经验教训
-    all_lessons = []
-    for reflection in reflections.values():
-        all_lessons.extend(reflection.get("lessons_learned", []))
+        parts.append("## 根本原因分析\n" + "\n".join(root_causes))
 
     if all_lessons:
-        parts.append("## 经验教训\n" + "\n".join(f"- {l}" for l in all_lessons[:5]))
-
-    # 收集预防措施
-    all_measures = []
-    for reflection in reflections.values():
-        all_measures.extend(reflection.get("prevention_measures", []))
+        parts.append("## 经验教训\n" + "\n".join(f"- {l}" for l in all_lessons))
 
     if all_measures:
-        parts.append("## 预防措施\n" + "\n".join(f"- {m}" for m in all_measures[:5]))
-
-    # 选择最佳的改进描述
-    best_improvement = ""
-    best_length = 0
-    for reflection in reflections.values():
-        imp = reflection.get("improved_description", "")
-        if len(imp) > best_length:
-            best_improvement = imp
-            best_length = len(imp)
+        parts.append("## 预防措施\n" + "\n".join(f"- {m}" for m in all_measures))
 
     if best_improvement:
         parts.append("## 改进方案\n" + best_improvement)
@@ -341,9 +376,13 @@ def _synthesize_improvement(
     return "\n\n".join(parts)
 
 
-def _find_current_subtask(subtasks: list[SubTask], cid: Optional[str]) -> Optional[SubTask]:
-    """查找当前子任务"""
-    return next((t for t in subtasks if t.id == cid), None)
+def _find_current_subtask(
+    subtasks: list[SubTask],
+    cid: Optional[str],
+    index: Optional[dict[str, int]] = None,
+) -> Optional[SubTask]:
+    """查找当前子任务（优先使用 state 中的 subtask_index）"""
+    return find_subtask(subtasks, cid, index)
 
 
 def _get_last_review(state: GraphState, task_id: str) -> Optional[dict]:
@@ -356,29 +395,37 @@ def _get_last_review(state: GraphState, task_id: str) -> Optional[dict]:
     )
 
 
-def _create_simple_improvement(state: GraphState, task: SubTask, issues: list[str]) -> dict:
-    """创建简单改进结果（当所有反思都失败时）"""
+def _create_simple_improvement(
+    state: GraphState,
+    task: SubTask,
+    issues: list[str],
+    event: str = "reflection_fallback",
+) -> dict:
+    """创建简单改进结果（审查未给出问题、或所有反思都失败时）
+
+    event 区分两种来源：reflection_skipped_no_issues / reflection_fallback
+    """
     improvement = f"\n需要改进的问题: {issues if issues else '无特定问题，请重新执行'}"
 
     new_description = task.description + f"\n\n--- 第 {task.retry_count + 1} 次反思改进 ---\n" + improvement
 
     subtasks = state.get("subtasks", [])
-    updated_subtasks = []
-    for t in subtasks:
-        if t.id == task.id:
-            updated_subtasks.append(t.model_copy(update={
-                "description": new_description,
-                "status": "pending",
-                "result": None,
-            }))
-        else:
-            updated_subtasks.append(t)
+    updated_subtasks = replace_subtask(
+        subtasks,
+        task.model_copy(update={
+            "description": new_description,
+            "status": "pending",
+            "result": None,
+        }),
+        state.get("subtask_index"),
+    )
 
     return {
         "subtasks": updated_subtasks,
+        "subtask_index": build_subtask_index(updated_subtasks),
         "phase": "executing",
         "execution_log": [{
-            "event": "reflection_fallback",
+            "event": event,
             "task_id": task.id,
             "timestamp": datetime.now().isoformat(),
         }],
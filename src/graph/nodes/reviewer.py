@@ -2,26 +2,55 @@
 import logging
 import re
 from datetime import datetime
-from typing import Optional
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
 
 from src.graph.state import GraphState, SubTask
 from src.agents.caller import get_caller
 from src.graph.utils.json_parser import extract_first_json_object
+from src.graph.utils.subtask_index import find_subtask
 
 logger = logging.getLogger(__name__)
 
 # 诨评为伪结果的特征樣式
-_FAKE_PATTERNS = [
+_FAKE_PATTERNS = (
     "2026-02-23T10:00:00Z",
     "2026-02-23T11:00:00Z",
     "Agent 123", "Agent 456",
     "虚假",
     "fake_",
     "placeholder",
-]
+)
+# 合并为单个忽略大小写的正则，一次扫描即可命中任意伪造模式
+# （re 的交替匹配在 C 层完成；模式仅个位数，无需引入 Aho-Corasick 依赖）
+_FAKE_RE = re.compile("|".join(re.escape(p) for p in _FAKE_PATTERNS), re.IGNORECASE)
+_FAKE_PATTERN_BY_LOWER = {p.lower(): p for p in _FAKE_PATTERNS}
+
+# 复现结构 / 证据锚点检测用正则（模块加载时预编译）
+_EXEC_BLOCK_RE = re.compile(r"```(?:bash|sh|shell|zsh|cmd|powershell)?\n[\s\S]*?```", re.IGNORECASE)
+# 步骤 / 预期 / 实际 / 结果 关键词合并为一个具名分组正则，一次 finditer 收集全部标记
+_REPRO_KEYWORD_RE = re.compile(
+    r"(?P<step>步骤|step\s*\d+|repro(?:duction)?\s+steps?)"
+    r"|(?P<expected>预期|expected)"
+    r"|(?P<actual>实际|actual)"
+    r"|(?P<outcome>结果|result)",
+    re.IGNORECASE,
+)
+_REPRO_KEYWORD_FLAGS = frozenset(("step", "expected", "actual", "outcome"))
+_SEARCH_CMD_RE = re.compile(r"\b(grep|rg|findstr|ripgrep|python\s+-c)\b")
+_PATH_RE = re.compile(r"(?:^|\s)(?:[A-Za-z]:/|/)?[\w./-]+\.[a-z0-9]+")
+_KEYWORD_ANCHORS = ("keyword", "关键词", "anchor")
 _MIN_RESULT_LEN = 50   # 结果少于 50 字符认为空白
 _FAST_PASS_MIN_LEN = 300
 
+# 只读的默认审查结果：热路径直接复用，不再每次新建 dict/list
+_DEFAULT_REVIEW: Mapping[str, Any] = MappingProxyType({
+    "verdict": "PASS", "score": 7, "issues": (), "suggestions": (),
+})
+_FAST_PASS_REVIEW: Mapping[str, Any] = MappingProxyType({
+    "verdict": "PASS", "score": 8, "issues": (), "suggestions": (),
+})
+
 
 async def reviewer_node(state: GraphState) -> dict:
     """
@@ -33,7 +62,7 @@ async def reviewer_node(state: GraphState) -> dict:
     subtasks = state.get("subtasks", [])
     cid = state.get("current_subtask_id")
 
-    current = _find_current_subtask(subtasks, cid)
+    current = _find_current_subtask(subtasks, cid, state.get("subtask_index"))
     if not current or not current.result:
         subtask_summary = [f"{t.id}:{t.status}" for t in subtasks[:8]]
         skip_reason = "missing_current_subtask" if not current else "missing_current_result"
@@ -50,14 +79,15 @@ async def reviewer_node(state: GraphState) -> dict:
         }
 
     # 本地快速验证：先做本地检查，通过且内容充分则直接 PASS，无需调用 subagent
-    local_issues = _validate_result_locally(current)
-    result_len = len((current.result or "").strip())
-    reproducible_locally = _has_local_reproducibility_structure(current.result or "")
+    # 复现结构标记只扫描一次，本地校验与 fast-pass 判定共用
+    repro_flags = _scan_repro_flags(current.result or "")
+    local_issues, result_len = _validate_result_locally(current, repro_flags)
+    reproducible_locally = _has_local_reproducibility_structure(result_len, repro_flags)
 
     if not local_issues and result_len >= _FAST_PASS_MIN_LEN and reproducible_locally:
         # 内容充分、本地验证通过且可复核结构齐备 → 直接 PASS，跳过 subagent reviewer（避免误判）
         logger.info("[reviewer] 本地快速通过 %s（%d 字符，结构完整）", current.id, result_len)
-        review = {"verdict": "PASS", "score": 8, "issues": [], "suggestions": []}
+        review = _FAST_PASS_REVIEW
     else:
         # 内容不足或本地发现问题 → 调用 reviewer subagent 深度审查
         call_result = await caller.call_reviewer(
@@ -85,9 +115,12 @@ async def reviewer_node(state: GraphState) -> dict:
 
         # 叠加本地问题
         if local_issues:
-            review["verdict"] = "FAIL"
-            review["issues"] = local_issues + review.get("issues", [])
-            review["score"] = min(review.get("score", 7), 4)
+            review = {
+                **review,
+                "verdict": "FAIL",
+                "issues": local_issues + list(review.get("issues", ())),
+                "score": min(review.get("score", 7), 4),
+            }
 
     # Reviewer is advisory-only in reliability mode:
     # never changes subtask status/retry lifecycle, only records review signals.
@@ -102,8 +135,8 @@ async def reviewer_node(state: GraphState) -> dict:
             "task_id": current.id,
             "verdict": review["verdict"],
             "score": review.get("score", 0),
-            "issues": review.get("issues", []),
-            "suggestions": review.get("suggestions", []),
+            "issues": list(review.get("issues", ())),
+            "suggestions": list(review.get("suggestions", ())),
             "advisory_only": True,
             "terminal": False,
             "subagent_called": "reviewer",
@@ -112,92 +145,128 @@ async def reviewer_node(state: GraphState) -> dict:
     }
 
 
-def _find_current_subtask(subtasks: list[SubTask], cid: Optional[str]) -> Optional[SubTask]:
-    """查找当前子任务"""
-    return next((t for t in subtasks if t.id == cid), None)
+def _find_current_subtask(
+    subtasks: list[SubTask],
+    cid: Optional[str],
+    index: Optional[dict[str, int]] = None,
+) -> Optional[SubTask]:
+    """查找当前子任务（优先使用 state 中的 subtask_index）"""
+    return find_subtask(subtasks, cid, index)
+
+
+def _validate_result_locally(task: SubTask, flags: frozenset[str]) -> tuple[list[str], int]:
+    """本地质量检查：不调用 subagent，直接检查结果内容正确性
 
+    Args:
+        flags: _scan_repro_flags(task.result) 的结果
 
-def _validate_result_locally(task: SubTask) -> list[str]:
-    """本地质量检查：不调用 subagent，直接检查结果内容正确性"""
+    Returns:
+        (问题列表, 去除首尾空白后的结果长度)
+    """
     issues = []
     result = task.result or ""
+    stripped = result.strip()
+    stripped_len = len(stripped)
+    is_placeholder = not result or stripped == f"任务 {task.title} 执行完成"
 
-    # 1. 结果过短
-    if len(result.strip()) < _MIN_RESULT_LEN:
-        issues.append(f"结果内容过短（{len(result.strip())} 字符），可能未完成")
+    # 1. 结果过短：已注定失败，跳过后续正则扫描直接返回
+    if stripped_len < _MIN_RESULT_LEN:
+        issues.append(f"结果内容过短（{stripped_len} 字符），可能未完成")
+        if is_placeholder:
+            issues.append("结果是默认占位符，实际未执行")
+        return issues, stripped_len
 
     # 2. 包含已知伪造模式
-    for pat in _FAKE_PATTERNS:
-        if pat.lower() in result.lower():
-            issues.append(f"结果包含伪造模式：'{pat}'，需要重新执行")
-            break
+    pat = _find_fake_pattern(stripped)
+    if pat:
+        issues.append(f"结果包含伪造模式：'{pat}'，需要重新执行")
 
     # 3. 验收标准检查（交由 subagent 评判） — 此处仅做基础模式检测
-    if not result or result.strip() == f"任务 {task.title} 执行完成":
+    if is_placeholder:
         issues.append("结果是默认占位符，实际未执行")
 
     # 4. 可执行复现入口：至少一个命令代码块
-    if not re.search(r"```(?:bash|sh|shell|zsh|cmd|powershell)?\n[\s\S]*?```", result, re.IGNORECASE):
+    if "exec_block" not in flags:
         issues.append("缺少可执行命令块（Reproduction/Verification 命令不可复现）")
 
     # 5. 复现步骤 + 预期/实际结果成对出现
-    has_steps = bool(re.search(r"(步骤|step\s*\d+|repro(duction)?\s+steps?)", result, re.IGNORECASE))
-    has_expected_actual = bool(re.search(r"(预期|expected)", result, re.IGNORECASE)) and bool(
-        re.search(r"(实际|actual)", result, re.IGNORECASE)
-    )
-    if not (has_steps and has_expected_actual):
+    if not ("step" in flags and "expected" in flags and "actual" in flags):
         issues.append("缺少“复现步骤 + 预期/实际结果”配对描述")
 
     # 6. 稳定证据锚点（关键词/检索命令/路径），禁止仅固定行号
-    if not _has_stable_evidence_anchor(result):
+    if "stable_anchor" not in flags:
         issues.append("证据锚点不稳定：需要关键词/检索命令/路径，不能仅依赖固定行号")
 
-    return issues
+    return issues, stripped_len
 
 
-def _has_local_reproducibility_structure(result: str) -> bool:
-    """快速判定是否具备最小可复核结构（供 fast-pass 使用）。"""
-    if not result or len(result.strip()) < _MIN_RESULT_LEN:
+def _find_fake_pattern(text: str) -> Optional[str]:
+    """单次线性扫描查找首个伪造模式，返回 _FAKE_PATTERNS 中的原始写法"""
+    match = _FAKE_RE.search(text)
+    if not match:
+        return None
+    return _FAKE_PATTERN_BY_LOWER.get(match.group(0).lower(), match.group(0))
+
+
+def _has_local_reproducibility_structure(result_len: int, flags: frozenset[str]) -> bool:
+    """快速判定是否具备最小可复核结构（供 fast-pass 使用）。
+
+    Args:
+        result_len: _validate_result_locally 返回的去空白后长度，避免重复 strip
+    """
+    if result_len < _MIN_RESULT_LEN:
         return False
 
-    has_exec_block = bool(re.search(r"```(?:bash|sh|shell|zsh|cmd|powershell)?\n[\s\S]*?```", result, re.IGNORECASE))
-    has_step_or_pair = (
-        bool(re.search(r"(步骤|step\s*\d+|repro(duction)?\s+steps?)", result, re.IGNORECASE))
-        and bool(re.search(r"(预期|expected|实际|actual|结果|result)", result, re.IGNORECASE))
+    has_step_or_pair = "step" in flags and (
+        "expected" in flags or "actual" in flags or "outcome" in flags
     )
-    has_stable_anchor = _has_stable_evidence_anchor(result)
 
-    return has_exec_block and has_step_or_pair and has_stable_anchor
+    return "exec_block" in flags and has_step_or_pair and "stable_anchor" in flags
 
 
-def _has_stable_evidence_anchor(result: str) -> bool:
-    """检查是否存在稳定证据锚点：关键词 / 检索命令 / 文件路径。"""
-    lower = result.lower()
-    has_keyword_anchor = any(k in lower for k in ["keyword", "关键词", "anchor"])
-    has_search_cmd = bool(re.search(r"\b(grep|rg|findstr|ripgrep|python\s+-c)\b", lower))
-    has_path_anchor = bool(re.search(r"(?:^|\s)(?:[A-Za-z]:/|/)?[\w./-]+\.[a-z0-9]+", result))
+def _scan_repro_flags(result: str) -> frozenset[str]:
+    """一次扫描收集复现结构标记，供本地校验与 fast-pass 判定共用
 
-    # 若仅含行号锚点且无关键词/命令/路径，不算稳定
-    only_line_anchor = bool(re.search(r"\bline\s*\d+\b|\bL\d+\b|:\d+\b", result, re.IGNORECASE)) and not (
-        has_keyword_anchor or has_search_cmd or has_path_anchor
-    )
-    if only_line_anchor:
-        return False
+    reviewer_node 对每个结果只调用一次，再把标记传给两处检查。
 
-    return has_keyword_anchor or has_search_cmd or has_path_anchor
+    Returns:
+        命中的标记集合：exec_block / step / expected / actual / outcome / stable_anchor
+    """
+    flags = set()
+    # 命令块必须以 ``` 开头，不含反引号围栏时跳过正则
+    if "```" in result and _EXEC_BLOCK_RE.search(result):
+        flags.add("exec_block")
+    for match in _REPRO_KEYWORD_RE.finditer(result):
+        flags.add(match.lastgroup)
+        if _REPRO_KEYWORD_FLAGS <= flags:
+            break
+    if _has_stable_evidence_anchor(result):
+        flags.add("stable_anchor")
+    return frozenset(flags)
 
 
-def _parse_review_result(call_result: dict) -> dict:
-    """解析审查结果（使用括号计数法提取 JSON，避免贪婪匹配问题）"""
-    default_review = {
-        "verdict": "PASS",
-        "score": 7,
-        "issues": [],
-        "suggestions": []
-    }
+def _has_stable_evidence_anchor(result: str) -> bool:
+    """检查是否存在稳定证据锚点：关键词 / 检索命令 / 文件路径。
 
+    仅有行号锚点（line 12 / L12 / :12）不算稳定：三类锚点都没有时本就返回 False，
+    因此无需单独扫描行号；按开销从低到高短路判断。
+    """
+    lower = result.lower()
+    if any(k in lower for k in _KEYWORD_ANCHORS):
+        return True
+    if _SEARCH_CMD_RE.search(lower):
+        return True
+    # 路径锚点必须带扩展名前的 "."，不含 "." 时跳过正则
+    return "." in result and bool(_PATH_RE.search(result))
+
+
+def _parse_review_result(call_result: dict) -> Mapping[str, Any]:
+    """解析审查结果（使用括号计数法提取 JSON，避免贪婪匹配问题）
+
+    解析失败时返回只读的 _DEFAULT_REVIEW，调用方需要修改时应构造新 dict。
+    """
     if not call_result.get("success"):
-        return default_review
+        return _DEFAULT_REVIEW
 
     result = call_result.get("result")
 
@@ -213,4 +282,4 @@ def _parse_review_result(call_result: dict) -> dict:
             "suggestions": result.get("suggestions", []),
         }
 
-    return default_review
+    return _DEFAULT_REVIEW
@@ -12,22 +12,33 @@ import asyncio
 import json
 from datetime import datetime
 from typing import Optional
-from statistics import mean
 
 from src.graph.state import GraphState, SubTask
 from src.agents.caller import get_caller
+from src.agents.pool_registry import get_pool
 from src.discussion.manager import discussion_manager
+from src.graph.utils.json_parser import extract_first_json_object
+from src.graph.utils.subtask_index import build_subtask_index, find_subtask, replace_subtask
 
 
 # 评审专家数量
 REVIEWER_COUNT = 3
 
+# 专用 reviewer agent ID（reviewer_1 ... reviewer_N）
+_REVIEWER_IDS = tuple(f"reviewer_{i}" for i in range(1, REVIEWER_COUNT + 1))
+
 # 通过阈值（至少 N 个 reviewer 通过）
 PASS_THRESHOLD = 2
 
 # 最低可接受平均分
 MIN_ACCEPTABLE_SCORE = 6.0
 
+# 评审结论一致时，评分差不超过该值视为无分歧（不发起讨论）
+_AGREEMENT_SCORE_SPREAD = 1
+
+# issues/suggestions 去重键长度
+_DEDUP_KEY_LEN = 50
+
 
 async def reviewer_v2_node(state: GraphState) -> dict:
     """
@@ -43,7 +54,7 @@ async def reviewer_v2_node(state: GraphState) -> dict:
     subtasks = state.get("subtasks", [])
     cid = state.get("current_subtask_id")
 
-    current = _find_current_subtask(subtasks, cid)
+    current = _find_current_subtask(subtasks, cid, state.get("subtask_index"))
     if not current or not current.result:
         return {"phase": "executing"}
 
@@ -55,17 +66,21 @@ async def reviewer_v2_node(state: GraphState) -> dict:
         return _create_fail_closed_result(state, current, "评审器全部失败或超时，触发闭锁")
 
     # === 阶段2: 投票决策 ===
-    verdict, final_score = _vote_on_reviews(reviews)
+    # 评分只收集一次，投票与分歧讨论共用
+    scores = [r.get("score", 7) for r in reviews]
+    verdict, final_score = _vote_on_reviews(reviews, scores)
 
     # === 阶段3: 合并反馈 ===
-    merged_issues = _merge_issues(reviews)
-    merged_suggestions = _merge_suggestions(reviews)
+    merged_issues, merged_suggestions = _merge_feedback(reviews)
+
+    # 本次调用只取一次时钟：discussion_id 与日志时间戳共用
+    now = datetime.now()
 
     # === 阶段4: 讨论确认（可选） ===
     if verdict == "REVISE" and len(reviews) >= 2:
         # 有分歧时发起讨论
-        discussion_id = f"review_{current.id}_{datetime.now().strftime('%H%M%S')}"
-        await _discuss_review_disagreement(discussion_id, reviews, current)
+        discussion_id = f"review_{current.id}_{now.strftime('%H%M%S')}"
+        await _discuss_review_disagreement(discussion_id, reviews, current, scores)
 
     # 纯函数式更新
     max_iter = state.get("max_iterations", 3)
@@ -76,18 +91,16 @@ async def reviewer_v2_node(state: GraphState) -> dict:
     else:
         new_status, new_retry = "pending", current.retry_count + 1
 
-    updated_subtasks = []
-    for t in subtasks:
-        if t.id == current.id:
-            updated_subtasks.append(t.model_copy(update={
-                "status": new_status,
-                "retry_count": new_retry,
-            }))
-        else:
-            updated_subtasks.append(t)
+    # 按索引定位后只替换当前子任务，不再整表扫描重建
+    updated_subtasks = replace_subtask(
+        subtasks,
+        current.model_copy(update={"status": new_status, "retry_count": new_retry}),
+        state.get("subtask_index"),
+    )
 
     return {
         "subtasks": updated_subtasks,
+        "subtask_index": build_subtask_index(updated_subtasks),
         "phase": "reviewing",
         "execution_log": [{
             "event": "multi_review_complete",
@@ -96,9 +109,11 @@ async def reviewer_v2_node(state: GraphState) -> dict:
             "final_score": final_score,
             "reviewer_count": len(reviews),
             "pass_count": sum(1 for r in reviews if r.get("verdict") == "PASS"),
+            "issues": merged_issues,
+            "suggestions": merged_suggestions,
             "issues_count": len(merged_issues),
             "suggestions_count": len(merged_suggestions),
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
         }],
     }
 
@@ -134,23 +149,46 @@ async def _parallel_review(caller, task: SubTask) -> list[dict]:
     # 获取可用的 reviewer agent
     reviewer_ids = _get_available_reviewers()
 
-    # 超时已禁用：让任务自然完成
-    results = await asyncio.gather(*[review_with_reviewer(rid) for rid in reviewer_ids])
+    # 超时已禁用：让任务自然完成；按完成顺序收集，结论已确定为 REVISE 时不再等待慢 reviewer
+    tasks = [asyncio.create_task(review_with_reviewer(rid)) for rid in reviewer_ids]
+    reviews: list[dict] = []
+    try:
+        for finished, fut in enumerate(asyncio.as_completed(tasks), start=1):
+            review = await fut
+            if review:
+                reviews.append(review)
+            if _revise_is_decided(reviews, len(tasks) - finished):
+                break
+    finally:
+        for t in tasks:
+            t.cancel()
+
+    return reviews
 
-    return [r for r in results if r]
+
+def _revise_is_decided(reviews: list[dict], pending: int) -> bool:
+    """剩余 pending 个评审即使全部 PASS 也无法翻盘时返回 True
+
+    只对 REVISE 提前结束：PASS 还取决于平均分，任何一个未返回的低分都可能把结论拉回 REVISE。
+    """
+    if pending == 0:
+        return False
+    pass_count = sum(1 for r in reviews if r.get("verdict") == "PASS")
+    revise_count = len(reviews) - pass_count
+    max_pass = pass_count + pending
+    # 达不到通过阈值，且多数票也不可能是 PASS → _vote_on_reviews 必然给出 REVISE
+    return max_pass < PASS_THRESHOLD and max_pass <= revise_count
 
 
 def _get_available_reviewers() -> list[str]:
     """获取可用的 reviewer agent ID 列表"""
-    reviewers = []
+    # 每次评审只取一次模板池；不跨调用缓存，模板池 reload/fill_agent 后立即生效
+    get_template = get_pool().get_template
 
     # 尝试使用 reviewer_1, reviewer_2, reviewer_3
-    for i in range(1, REVIEWER_COUNT + 1):
-        reviewer_id = f"reviewer_{i}"
-        from src.agents.pool_registry import get_pool
-        pool = get_pool()
-        if pool.get_template(reviewer_id):
-            reviewers.append(reviewer_id)
+    reviewers = [
+        reviewer_id for reviewer_id in _REVIEWER_IDS if get_template(reviewer_id)
+    ]
 
     # 如果没有专用 reviewer，使用主 reviewer
     if not reviewers:
@@ -160,17 +198,10 @@ def _get_available_reviewers() -> list[str]:
 
 
 def _parse_review_result(result_data) -> Optional[dict]:
-    """解析评审结果"""
-    import re
-
+    """解析评审结果（raw_decode 提取首个 JSON 对象，避免贪婪正则回溯）"""
     if isinstance(result_data, str):
-        match = re.search(r'\{.*\}', result_data, re.DOTALL)
-        if match:
-            try:
-                data = json.loads(match.group(0))
-            except json.JSONDecodeError:
-                return None
-        else:
+        data = extract_first_json_object(result_data)
+        if data is None:
             return None
     elif isinstance(result_data, dict):
         data = result_data
@@ -186,7 +217,7 @@ def _parse_review_result(result_data) -> Optional[dict]:
     }
 
 
-def _vote_on_reviews(reviews: list[dict]) -> tuple[str, float]:
+def _vote_on_reviews(reviews: list[dict], scores: list[float]) -> tuple[str, float]:
     """
     投票决定最终结论
 
@@ -196,6 +227,10 @@ def _vote_on_reviews(reviews: list[dict]) -> tuple[str, float]:
     3. 平均分 < 最低分数 → REVISE
     4. 否则按多数票决定
 
+    Args:
+        reviews: 评审结果列表
+        scores: 与 reviews 一一对应的评分
+
     Returns:
         (verdict, final_score)
     """
@@ -206,9 +241,8 @@ def _vote_on_reviews(reviews: list[dict]) -> tuple[str, float]:
     pass_count = sum(1 for r in reviews if r.get("verdict") == "PASS")
     revise_count = len(reviews) - pass_count
 
-    # 计算平均分
-    scores = [r.get("score", 7) for r in reviews]
-    avg_score = mean(scores) if scores else 7.0
+    # 计算平均分（评分是少量浮点数，sum/len 即可，无需 statistics.mean 的精确有理运算）
+    avg_score = sum(scores) / len(scores) if scores else 7.0
 
     # 投票决策
     if pass_count >= PASS_THRESHOLD and avg_score >= MIN_ACCEPTABLE_SCORE:
@@ -224,40 +258,39 @@ def _vote_on_reviews(reviews: list[dict]) -> tuple[str, float]:
         return ("REVISE", round(avg_score, 1))
 
 
-def _merge_issues(reviews: list[dict]) -> list[str]:
-    """合并所有问题（去重）"""
-    all_issues = []
-    seen = set()
-
-    for review in reviews:
-        for issue in review.get("issues", []):
-            issue_key = issue.lower().strip()[:50]  # 简化去重键
-            if issue_key not in seen:
-                all_issues.append(issue)
-                seen.add(issue_key)
+def _merge_feedback(reviews: list[dict]) -> tuple[list[str], list[str]]:
+    """单次遍历合并所有问题与建议（各自去重，保留首次出现的原文）
 
-    return all_issues
+    去重键先截取再转小写：长文本只对前 _DEDUP_KEY_LEN 个字符做 lower。
 
-
-def _merge_suggestions(reviews: list[dict]) -> list[str]:
-    """合并所有建议（去重）"""
-    all_suggestions = []
-    seen = set()
+    Returns:
+        (issues, suggestions)
+    """
+    issues: list[str] = []
+    suggestions: list[str] = []
+    seen_issues: set[str] = set()
+    seen_suggestions: set[str] = set()
 
     for review in reviews:
-        for suggestion in review.get("suggestions", []):
-            suggestion_key = suggestion.lower().strip()[:50]
-            if suggestion_key not in seen:
-                all_suggestions.append(suggestion)
-                seen.add(suggestion_key)
+        for issue in review.get("issues", ()):
+            key = issue.strip()[:_DEDUP_KEY_LEN].lower()  # 简化去重键
+            if key not in seen_issues:
+                seen_issues.add(key)
+                issues.append(issue)
+        for suggestion in review.get("suggestions", ()):
+            key = suggestion.strip()[:_DEDUP_KEY_LEN].lower()
+            if key not in seen_suggestions:
+                seen_suggestions.add(key)
+                suggestions.append(suggestion)
 
-    return all_suggestions
+    return issues, suggestions
 
 
 async def _discuss_review_disagreement(
     discussion_id: str,
     reviews: list[dict],
-    task: SubTask
+    task: SubTask,
+    scores: list[float],
 ):
     """
     当评审意见分歧时，发起讨论
@@ -265,12 +298,20 @@ async def _discuss_review_disagreement(
     分歧场景:
     - PASS 和 REVISE 票数相近
     - 评分差异大（最高分 - 最低分 > 3）
+
+    结论一致且评分差不超过 _AGREEMENT_SCORE_SPREAD 时没有真正的分歧，不创建讨论。
     """
+    if (
+        len({r.get("verdict") for r in reviews}) == 1
+        and max(scores) - min(scores) <= _AGREEMENT_SCORE_SPREAD
+    ):
+        return
+
     discussion_manager.create_discussion(discussion_id)
 
-    # 提交各评审意见
-    for i, review in enumerate(reviews):
-        await discussion_manager.post_message(
+    # 各评审意见相互独立：先序列化，再并发投递（add_message 在首个 await 前完成，顺序不变）
+    posts = [
+        discussion_manager.post_message(
             node_id=discussion_id,
             from_agent=f"reviewer_{i + 1}",
             content=json.dumps({
@@ -280,23 +321,30 @@ async def _discuss_review_disagreement(
             }, ensure_ascii=False),
             message_type="review_opinion",
         )
+        for i, review in enumerate(reviews)
+    ]
 
     # 检查分歧程度
-    scores = [r.get("score", 7) for r in reviews]
     score_range = max(scores) - min(scores) if scores else 0
 
     if score_range > 3:
-        await discussion_manager.post_message(
+        posts.append(discussion_manager.post_message(
             node_id=discussion_id,
             from_agent="review_coordinator",
             content=f"检测到评分分歧：最高 {max(scores)}，最低 {min(scores)}，差异 {score_range}",
             message_type="disagreement_alert",
-        )
+        ))
+
+    await asyncio.gather(*posts)
 
 
-def _find_current_subtask(subtasks: list[SubTask], cid: Optional[str]) -> Optional[SubTask]:
-    """查找当前子任务"""
-    return next((t for t in subtasks if t.id == cid), None)
+def _find_current_subtask(
+    subtasks: list[SubTask],
+    cid: Optional[str],
+    index: Optional[dict[str, int]] = None,
+) -> Optional[SubTask]:
+    """查找当前子任务（优先使用 state 中的 subtask_index）"""
+    return find_subtask(subtasks, cid, index)
 
 
 def _create_fail_closed_result(state: GraphState, task: SubTask, reason: str) -> dict:
@@ -309,18 +357,16 @@ def _create_fail_closed_result(state: GraphState, task: SubTask, reason: str) ->
     else:
         new_status, new_retry = "pending", task.retry_count + 1
 
-    updated_subtasks = []
-    for t in subtasks:
-        if t.id == task.id:
-            updated_subtasks.append(t.model_copy(update={
-                "status": new_status,
-                "retry_count": new_retry,
-            }))
-        else:
-            updated_subtasks.append(t)
+    # 按索引定位后只替换当前子任务，不再整表扫描重建
+    updated_subtasks = replace_subtask(
+        subtasks,
+        task.model_copy(update={"status": new_status, "retry_count": new_retry}),
+        state.get("subtask_index"),
+    )
 
     return {
         "subtasks": updated_subtasks,
+        "subtask_index": build_subtask_index(updated_subtasks),
         "phase": "reviewing",
         "execution_log": [{
             "event": "review_fail_closed",
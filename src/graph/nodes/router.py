@@ -1,10 +1,18 @@
 """src/graph/nodes/router.py — 全局路由节点"""
+import asyncio
 from datetime import datetime
 from pathlib import Path
 import json
-from src.graph.state import GraphState
+import os
+
+import orjson
+
+from src.graph.state import GraphState, TERMINAL_STATUSES
 
 _REPORTS_DIR = Path("reports")
+_REPORT_JSON_OPTS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+# 汇总输出中的子任务图标：其余状态（含 skipped）统一显示 ⏳
+_RESULT_ICONS = {"done": "✅", "failed": "❌"}
 
 
 async def router_node(state: GraphState) -> dict:
@@ -33,17 +41,24 @@ async def router_node(state: GraphState) -> dict:
     )
     if isinstance(policy, dict):
         strict = bool(policy.get("strict_enforcement", False))
-    all_terminal = bool(subtasks) and all(
-        t.status in ("done", "skipped", "failed") for t in subtasks
-    )
-    strict_blocked = strict and any(
-        str(getattr(t, "status", "") or "").strip() == "failed" for t in subtasks
-    )
+    # 单次遍历：遇到非终态立即停止；has_failed 只在全部终态时才会被使用
+    all_terminal = bool(subtasks)
+    has_failed = False
+    for t in subtasks:
+        status = t.status
+        if status not in TERMINAL_STATUSES:
+            all_terminal = False
+            break
+        if status == "failed":
+            has_failed = True
+    strict_blocked = strict and has_failed
 
     if all_terminal and not strict_blocked:
+        # 汇总会同步读取全部报告文件，放到工作线程执行，避免阻塞事件循环
+        final_output = await asyncio.to_thread(_build_final_output, state, budget)
         return {
             "phase": "complete",
-            "final_output": _build_final_output(state, budget=budget),
+            "final_output": final_output,
             "time_budget": budget,
         }
 
@@ -86,7 +101,7 @@ def _build_final_output(state: GraphState, budget=None) -> str:
 
     subtasks = state.get("subtasks", [])
     for t in subtasks:
-        icon = "✅" if t.status == "done" else "❌" if t.status == "failed" else "⏳"
+        icon = _RESULT_ICONS.get(t.status, "⏳")
         lines.append(f"### {icon} {t.title}")
         if t.result:
             lines.append(t.result)
@@ -98,15 +113,25 @@ def _build_final_output(state: GraphState, budget=None) -> str:
         elapsed = eff_budget.elapsed_minutes
         # 如果 elapsed_minutes 仍为 0（budget 没有排过 router）, 尝试实时计算
         if elapsed == 0 and eff_budget.started_at:
-            from datetime import datetime as _dt
-            elapsed = (_dt.now() - eff_budget.started_at).total_seconds() / 60
+            elapsed = (datetime.now() - eff_budget.started_at).total_seconds() / 60
         lines.append(
             f"\n---\n总耗时 {elapsed:.1f} 分钟 "
             f"/ 预算 {eff_budget.total_minutes:.0f} 分钟"
         )
 
-    report_sections = []
-    artifacts = dict(state.get("artifacts") or {})
+    # 只读访问，无需拷贝
+    report_sections = _collect_report_sections(subtasks, state.get("artifacts") or {})
+
+    if report_sections:
+        lines.append("\n---\n## 📁 详细分析报告\n")
+        lines.extend(report_sections)
+
+    return "\n".join(lines)
+
+
+def _collect_report_sections(subtasks: list, artifacts: dict) -> list[str]:
+    """收集详细报告片段：优先使用 artifacts 索引，索引为空/失效时兜底扫描 reports 目录"""
+    report_sections: list[str] = []
 
     for t in subtasks:
         candidate_paths = []
@@ -115,58 +140,76 @@ def _build_final_output(state: GraphState, budget=None) -> str:
             if path and path not in candidate_paths:
                 candidate_paths.append(path)
 
+        # 每个子任务取第一个可读的 md/json 报告
         for p in candidate_paths:
             report_path = Path(p)
-            if not report_path.exists() or not report_path.is_file():
+            # is_file() 对不存在的路径返回 False，单次 stat 即可
+            if not report_path.is_file():
                 continue
-
             suffix = report_path.suffix.lower()
+            if suffix not in (".md", ".json"):
+                continue
             try:
-                if suffix == ".md":
-                    content = report_path.read_text(encoding="utf-8", errors="replace")
-                    report_sections.append(f"### {report_path.stem}\n")
-                    report_sections.append(content)
-                    report_sections.append("\n")
-                    break
-                if suffix == ".json":
-                    data = json.loads(report_path.read_text(encoding="utf-8", errors="replace"))
-                    report_sections.append(f"### {report_path.stem}\n")
-                    report_sections.append(f"```json\n{json.dumps(data, ensure_ascii=False, indent=2)}\n```\n")
-                    break
+                report_sections.extend(_format_report_section(report_path, suffix))
+                break
             except Exception:
                 continue
 
-    # reports 目录兜底扫描：仅在索引为空/失效时启用
+    # reports 目录兜底扫描：仅在索引为空/失效时启用（先 md 后 json，各按 mtime 升序）
     if _REPORTS_DIR.exists() and not report_sections:
-        md_files = sorted(
-            _REPORTS_DIR.glob("*.md"),
-            key=lambda p: p.stat().st_mtime,
-        )
-        if md_files:
-            for f in md_files:
+        md_files, json_files = _scan_reports_by_mtime()
+        for suffix, files in ((".md", md_files), (".json", json_files)):
+            for f in files:
                 try:
-                    content = f.read_text(encoding="utf-8", errors="replace")
-                    report_sections.append(f"### {f.stem}\n")
-                    report_sections.append(content)
-                    report_sections.append("\n")
+                    report_sections.extend(_format_report_section(f, suffix))
                 except Exception:
                     pass
 
-        json_files = sorted(
-            _REPORTS_DIR.glob("*.json"),
-            key=lambda p: p.stat().st_mtime,
-        )
-        if json_files:
-            for f in json_files:
-                try:
-                    data = json.loads(f.read_text(encoding="utf-8", errors="replace"))
-                    report_sections.append(f"### {f.stem}\n")
-                    report_sections.append(f"```json\n{json.dumps(data, ensure_ascii=False, indent=2)}\n```\n")
-                except Exception:
-                    pass
+    return report_sections
+
+
+def _format_report_section(path: Path, suffix: str) -> list[str]:
+    """将单个报告文件格式化为输出片段（md 原样嵌入，json 缩进后放入代码块）"""
+    if suffix == ".md":
+        content = path.read_text(encoding="utf-8", errors="replace")
+        return [f"### {path.stem}\n", content, "\n"]
+    rendered = _render_report_json(path)
+    return [f"### {path.stem}\n", f"```json\n{rendered}\n```\n"]
+
+
+def _scan_reports_by_mtime() -> tuple[list[Path], list[Path]]:
+    """单次 scandir 遍历 reports 目录，按 mtime 升序返回 (md 文件, json 文件)"""
+    md_entries: list[tuple[float, str]] = []
+    json_entries: list[tuple[float, str]] = []
+    with os.scandir(_REPORTS_DIR) as it:
+        for entry in it:
+            if entry.name.endswith(".md"):
+                bucket = md_entries
+            elif entry.name.endswith(".json"):
+                bucket = json_entries
+            else:
+                continue
+            try:
+                if entry.is_file():
+                    bucket.append((entry.stat().st_mtime, entry.path))
+            except OSError:
+                continue
 
-    if report_sections:
-        lines.append("\n---\n## 📁 详细分析报告\n")
-        lines.extend(report_sections)
+    def by_mtime(entries: list[tuple[float, str]]) -> list[Path]:
+        # 只按 mtime 排序（稳定排序），同 mtime 保持目录遍历顺序
+        return [Path(path) for _, path in sorted(entries, key=lambda e: e[0])]
 
-    return "\n".join(lines)
+    return by_mtime(md_entries), by_mtime(json_entries)
+
+
+def _render_report_json(path: Path) -> str:
+    """读取 JSON 报告并格式化为缩进文本
+
+    以 errors="replace" 读取，非法 UTF-8 不会让报告被丢弃；orjson 不接受的
+    内容（NaN/Infinity、超 64 位整数等）回退到标准库 json，与原行为一致。
+    """
+    text = path.read_text(encoding="utf-8", errors="replace")
+    try:
+        return orjson.dumps(orjson.loads(text), option=_REPORT_JSON_OPTS).decode()
+    except (orjson.JSONDecodeError, orjson.JSONEncodeError):
+        return json.dumps(json.loads(text), ensure_ascii=False, indent=2)
@@ -74,6 +74,10 @@ class NodeDiscussion(BaseModel):
 # 增强的子任务模型
 # ═══════════════════════════════════════════════════════════════
 
+# 子任务终态（不再调度执行）：router / edges 的完成判定共用
+TERMINAL_STATUSES = frozenset(("done", "skipped", "failed"))
+
+
 class SubTask(BaseModel):
     """一个被分解出的子任务"""
     id: str                                    # 如 "task-001"
@@ -149,6 +153,7 @@ class GraphState(TypedDict, total=False):
     # 任务分解
     subtasks: list[SubTask]
     current_subtask_id: str | None
+    subtask_index: dict[str, int]               # 子任务 id → subtasks 列表位置（查找提示）
 
     # 🆕 讨论库（按节点 ID 索引）
     discussions: dict[str, NodeDiscussion]
@@ -1,21 +1,34 @@
 """src/graph/utils/json_parser.py — 健壮的 JSON 提取工具
 
-修复正则贪婪匹配问题：使用括号计数法代替 r'{.*}' 贪婪匹配，
-确保多 JSON 对象场景下只提取第一个有效对象。
+修复正则贪婪匹配问题：从每个 '{' / '[' 起用 json.JSONDecoder.raw_decode
+解析，代替 r'{.*}' 贪婪匹配，确保多 JSON 对象场景下只提取第一个有效对象。
 """
 from __future__ import annotations
 
 import json
 import re
 
+# markdown 代码块围栏（模块加载时预编译）
+_FENCE_HEAD_RE = re.compile(r'^```(?:json)?\s*', re.MULTILINE)
+_FENCE_TAIL_RE = re.compile(r'```\s*$', re.MULTILINE)
+
+_DECODER = json.JSONDecoder()
+
+
+def _strip_fences(text: str) -> str:
+    """去除 markdown 代码块包装（```json ... ```）"""
+    cleaned = _FENCE_HEAD_RE.sub('', text.strip())
+    return _FENCE_TAIL_RE.sub('', cleaned.strip())
+
 
 def extract_first_json_object(text: str) -> dict | None:
     """
     从任意文本中提取第一个有效的 JSON 对象（花括号包裹）。
 
-    使用括号计数法而非正则贪婪匹配，正确处理：
+    使用 raw_decode 而非正则贪婪匹配，正确处理：
     - LLM 返回多个 JSON 对象
     - 嵌套 JSON 结构
+    - 字符串值中的花括号 / 转义引号
     - 代码块包裹（```json ... ```）
 
     Returns:
@@ -24,29 +37,13 @@ def extract_first_json_object(text: str) -> dict | None:
     if not text:
         return None
 
-    # 先尝试去除 markdown 代码块
-    cleaned = re.sub(r'^```(?:json)?\s*', '', text.strip(), flags=re.MULTILINE)
-    cleaned = re.sub(r'```\s*$', '', cleaned.strip(), flags=re.MULTILINE)
-
-    # 括号计数法：找到第一个完整的 {} 对象
-    brace_count = 0
-    start: int | None = None
-    for i, ch in enumerate(cleaned):
-        if ch == '{':
-            if start is None:
-                start = i
-            brace_count += 1
-        elif ch == '}':
-            brace_count -= 1
-            if brace_count == 0 and start is not None:
-                candidate = cleaned[start: i + 1]
-                try:
-                    return json.loads(candidate)
-                except json.JSONDecodeError:
-                    # 该段无效，继续查找下一个
-                    start = None
-                    continue
-    return None
+    # 先去除 markdown 代码块
+    return _extract_object_from_cleaned(_strip_fences(text))
+
+
+def _extract_object_from_cleaned(cleaned: str) -> dict | None:
+    """在已去除代码块包装的文本中提取第一个 JSON 对象"""
+    return _raw_decode_first(cleaned, '{')
 
 
 def extract_first_json_array(text: str) -> list | None:
@@ -59,25 +56,27 @@ def extract_first_json_array(text: str) -> list | None:
     if not text:
         return None
 
-    cleaned = re.sub(r'^```(?:json)?\s*', '', text.strip(), flags=re.MULTILINE)
-    cleaned = re.sub(r'```\s*$', '', cleaned.strip(), flags=re.MULTILINE)
-
-    bracket_count = 0
-    start: int | None = None
-    for i, ch in enumerate(cleaned):
-        if ch == '[':
-            if start is None:
-                start = i
-            bracket_count += 1
-        elif ch == ']':
-            bracket_count -= 1
-            if bracket_count == 0 and start is not None:
-                candidate = cleaned[start: i + 1]
-                try:
-                    return json.loads(candidate)
-                except json.JSONDecodeError:
-                    start = None
-                    continue
+    return _extract_array_from_cleaned(_strip_fences(text))
+
+
+def _extract_array_from_cleaned(cleaned: str) -> list | None:
+    """在已去除代码块包装的文本中提取第一个 JSON 数组"""
+    return _raw_decode_first(cleaned, '[')
+
+
+def _raw_decode_first(text: str, opener: str) -> dict | list | None:
+    """从每个 opener 位置尝试 raw_decode，返回第一个解析成功的值
+
+    raw_decode 是 C 实现的完整 JSON 解析器：在首个完整值处停止，
+    字符串内的括号和转义都按 JSON 语法处理；失败时跳到下一个 opener，不回溯。
+    """
+    idx = text.find(opener)
+    while idx != -1:
+        try:
+            return _DECODER.raw_decode(text, idx)[0]
+        except (json.JSONDecodeError, RecursionError):
+            # RecursionError：极深嵌套的片段，跳过
+            idx = text.find(opener, idx + 1)
     return None
 
 
@@ -91,18 +90,17 @@ def safe_parse_json(text: str) -> dict | list | None:
     if not text:
         return None
 
-    # 去除 markdown 包装后尝试整体解析
-    cleaned = re.sub(r'^```(?:json)?\s*', '', text.strip(), flags=re.MULTILINE)
-    cleaned = re.sub(r'```\s*$', '', cleaned.strip(), flags=re.MULTILINE)
+    # 去除 markdown 包装后尝试整体解析（只去除一次，后续提取复用 cleaned）
+    cleaned = _strip_fences(text)
     try:
         return json.loads(cleaned)
-    except json.JSONDecodeError:
+    except (json.JSONDecodeError, RecursionError):
         pass
 
     # 尝试提取对象
-    obj = extract_first_json_object(text)
+    obj = _extract_object_from_cleaned(cleaned)
     if obj is not None:
         return obj
 
     # 尝试提取数组
-    return extract_first_json_array(text)
+    return _extract_array_from_cleaned(cleaned)
@@ -0,0 +1,61 @@
+"""src/graph/utils/subtask_index.py — 子任务 id → 位置索引
+
+GraphState.subtask_index 记录每个子任务 id 在 subtasks 列表中的位置，
+供各节点 O(1) 定位当前子任务。索引只作为提示：命中后会校验
+subtasks[pos].id，过期或缺失时退回线性扫描，因此未同步索引的节点
+不会导致读到旧的子任务对象。
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+from src.graph.state import SubTask
+
+
+def build_subtask_index(subtasks: list[SubTask]) -> dict[str, int]:
+    """构建 id → 列表位置 的索引（id 重复时保留第一个，与线性扫描一致）"""
+    index: dict[str, int] = {}
+    for i, t in enumerate(subtasks):
+        index.setdefault(t.id, i)
+    return index
+
+
+def find_subtask(
+    subtasks: list[SubTask],
+    task_id: Optional[str],
+    index: Optional[dict[str, int]] = None,
+) -> Optional[SubTask]:
+    """按 id 查找子任务：优先走索引，校验失败时退回线性扫描"""
+    pos = _locate(subtasks, task_id, index)
+    return subtasks[pos] if pos is not None else None
+
+
+def replace_subtask(
+    subtasks: list[SubTask],
+    new_task: SubTask,
+    index: Optional[dict[str, int]] = None,
+) -> list[SubTask]:
+    """返回将 new_task.id 所在位置替换为 new_task 的新列表
+
+    浅拷贝列表后按位置替换，其余子任务对象原样复用；id 不存在时返回原内容的副本。
+    """
+    updated = list(subtasks)
+    pos = _locate(subtasks, new_task.id, index)
+    if pos is not None:
+        updated[pos] = new_task
+    return updated
+
+
+def _locate(
+    subtasks: list[SubTask],
+    task_id: Optional[str],
+    index: Optional[dict[str, int]],
+) -> Optional[int]:
+    """定位子任务位置：索引命中且校验通过直接返回，否则线性扫描首个匹配"""
+    if task_id is None:
+        return None
+    if index:
+        pos = index.get(task_id)
+        if pos is not None and pos < len(subtasks) and subtasks[pos].id == task_id:
+            return pos
+    return next((i for i, t in enumerate(subtasks) if t.id == task_id), None)
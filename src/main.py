@@ -19,6 +19,15 @@ from pathlib import Path
 from src.graph.state import GraphState, TimeBudget
 from src.graph.builder import build_graph
 
+# 子任务状态 → 进度图标
+_STATUS_ICONS = {
+    "pending": "⏳",
+    "running": "🔄",
+    "done": "✅",
+    "failed": "❌",
+    "skipped": "⏭️",
+}
+
 
 async def run_task(task: str, time_minutes: float | None = None) -> dict:
     """
@@ -68,13 +77,7 @@ async def run_task(task: str, time_minutes: float | None = None) -> dict:
                 # 显示子任务进度
                 subtasks = state_update.get("subtasks", [])
                 for t in subtasks:
-                    status_icon = {
-                        "pending": "⏳",
-                        "running": "🔄",
-                        "done": "✅",
-                        "failed": "❌",
-                        "skipped": "⏭️",
-                    }.get(t.status, "❓")
+                    status_icon = _STATUS_ICONS.get(t.status, "❓")
                     print(f"  {status_icon} {t.id}: {t.title}")
 
                 final_state = state_update
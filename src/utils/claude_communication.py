@@ -4,11 +4,26 @@
 支持三种唤醒场景：崩溃、决策、卡壳。
 """
 
-import json
+import os
+import time
 from pathlib import Path
 from datetime import datetime
 from typing import Any
 
+import orjson
+
+# 等待决策结果时的初始轮询间隔（秒），之后指数退避到调用方给定的 poll_interval
+_MIN_POLL_INTERVAL = 0.1
+# orjson 直接输出 UTF-8（等价于 ensure_ascii=False），缩进保持与原文件一致
+_JSON_WRITE_OPTS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+
+
+def _write_json_atomic(path: Path, data: dict) -> None:
+    """先写临时文件再 os.replace，读取方不会看到写了一半的 JSON"""
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(orjson.dumps(data, option=_JSON_WRITE_OPTS))
+    os.replace(tmp, path)
+
 
 def request_decision(
     question: str,
@@ -42,8 +57,7 @@ def request_decision(
 
     # 写入请求文件（触发 CLAUDE.md 唤醒）
     path = Path("decision_request.json")
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(request_data, f, indent=2, ensure_ascii=False)
+    _write_json_atomic(path, request_data)
 
     return request_id
 
@@ -52,28 +66,38 @@ def get_decision_result(timeout: float = 300.0, poll_interval: float = 5.0) -> d
     """
     获取决策结果
 
+    轮询间隔从 _MIN_POLL_INTERVAL 开始指数退避到 poll_interval：
+    快速给出的决策几乎无等待延迟，长时间等待时检查频率不高于 poll_interval。
+
     Args:
         timeout: 超时时间（秒）
-        poll_interval: 轮询间隔（秒）
+        poll_interval: 最大轮询间隔（秒）
 
     Returns:
         决策结果字典，如果超时则返回 None
     """
-    import time
-
     result_path = Path("decision_result.json")
-    start_time = time.time()
+    deadline = time.monotonic() + timeout
+    interval = min(_MIN_POLL_INTERVAL, poll_interval)
 
-    while time.time() - start_time < timeout:
+    while True:
         if result_path.exists():
-            with open(result_path, "r", encoding="utf-8") as f:
-                result = json.load(f)
-            # 读取后删除结果文件
-            result_path.unlink()
-            return result
-        time.sleep(poll_interval)
-
-    return None
+            try:
+                result = orjson.loads(result_path.read_bytes())
+            except orjson.JSONDecodeError:
+                # 结果文件由外部写入，可能尚未写完：下一轮再读
+                pass
+            else:
+                # 读取后删除结果文件
+                result_path.unlink()
+                return result
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        # 不睡过截止时间
+        time.sleep(min(interval, remaining))
+        interval = min(interval * 2, poll_interval)
 
 
 def report_stuck(
@@ -103,8 +127,7 @@ def report_stuck(
     }
 
     path = Path("stuck_report.json")
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(report_data, f, indent=2, ensure_ascii=False)
+    _write_json_atomic(path, report_data)
 
     return "stuck_report.json"
 
@@ -141,8 +164,7 @@ def report_crash(
     # 确保 reports/ 目录存在
     Path("reports").mkdir(exist_ok=True)
     path = Path("reports/crash_report.json")
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(report_data, f, indent=2, ensure_ascii=False)
+    _write_json_atomic(path, report_data)
 
     return "reports/crash_report.json"
 
@@ -1,5 +1,6 @@
 """src/utils/config.py — 配置加载"""
 import os
+from functools import lru_cache
 from dataclasses import dataclass
 from dotenv import load_dotenv
 
@@ -14,7 +15,12 @@ class Config:
     default_timeout: int = 60
 
 
+@lru_cache(maxsize=1)
 def get_config() -> Config:
+    """读取环境变量构建配置（进程内只解析一次）
+
+    运行期修改环境变量后需调用 get_config.cache_clear() 重新加载。
+    """
     return Config(
         api_key=os.getenv("ANTHROPIC_API_KEY", ""),
         model=os.getenv("DEFAULT_MODEL", "gpt-5.3-codex"),
@@ -4,8 +4,11 @@
 提供全局配置的日志记录器，替代 print() 输出。
 """
 
+import atexit
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 
 # 日志格式
@@ -14,6 +17,8 @@ DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 
 # 全局配置标志
 _configured = False
+# 后台写日志线程：调用方只做入队，stdout/文件 I/O 不会阻塞事件循环
+_listener: QueueListener | None = None
 
 
 def setup_logging(
@@ -29,28 +34,48 @@ def setup_logging(
         log_file: 日志文件路径 (可选)
         format_string: 日志格式
     """
-    global _configured
+    global _configured, _listener
 
     if _configured:
         return
 
-    handlers = [logging.StreamHandler(sys.stdout)]
+    root = logging.getLogger()
+    # 与 logging.basicConfig 一致：根记录器已有 handler 时不再重复配置
+    if root.handlers:
+        _configured = True
+        return
+
+    formatter = logging.Formatter(format_string, DATE_FORMAT)
+    handlers: list[logging.Handler] = [logging.StreamHandler(sys.stdout)]
 
     if log_file:
         log_path = Path(log_file)
         log_path.parent.mkdir(parents=True, exist_ok=True)
         handlers.append(logging.FileHandler(log_path, encoding='utf-8'))
 
-    logging.basicConfig(
-        level=level,
-        format=format_string,
-        datefmt=DATE_FORMAT,
-        handlers=handlers
-    )
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    # 实际写出由 QueueListener 的后台线程完成；QueueHandler 只负责入队
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_stop_listener)
+
+    root.setLevel(level)
+    root.addHandler(QueueHandler(log_queue))
 
     _configured = True
 
 
+def _stop_listener() -> None:
+    """停止后台写日志线程并写出队列中剩余的记录（可重复调用）"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     获取指定名称的日志记录器
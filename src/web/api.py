@@ -5,7 +5,10 @@ import json
 import logging
 import os
 import re
+import secrets
 import traceback
+from collections import deque
+from itertools import islice
 
 logger = logging.getLogger(__name__)
 _UNSET = object()
@@ -25,15 +28,17 @@ from typing import Optional, Any
 from contextlib import asynccontextmanager
 from pathlib import Path
 
+import orjson
 from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, FileResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field, model_validator
 
 from src.graph.state import GraphState, SubTask, TimeBudget, ExecutionPolicy
 from src.graph.builder import build_graph
 from src.graph.dynamic_builder import DynamicGraphBuilder
+from src.graph.utils.json_parser import extract_first_json_object
 from src.discussion.manager import DiscussionManager, discussion_manager
 from src.agents.sdk_executor import get_executor
 from scripts import init_project
@@ -100,7 +105,104 @@ class ChatRequest(BaseModel):
 _STATE_FILE = Path("app_state.json")
 _REPORTS_DIR = Path("reports")
 _EXPORTS_DIR = Path("exports") / "tasks"
+_INDEX_HTML = Path("src/web/static/index.html")
+_TERMINAL_LOG_MAX = 500
+# 创建新任务时从 reports/ 清理的旧报告后缀
+_SWEPT_REPORT_SUFFIXES = (".md", ".json", ".txt")
+_INDEX_CACHE_CONTROL = "public, max-age=60"
 _SAFE_REPORT_NAME = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]{0,127}$")
+_SDK_JSON_FENCE_RE = re.compile(r"```(?:json)?\s*([\s\S]*?)\s*```", re.IGNORECASE)
+# 每个 WebSocket 连接最多积压的待发送消息数，超出视为慢连接并断开
+_WS_SEND_QUEUE_SIZE = 256
+# 因积压被断开时使用的关闭码（1013: Try Again Later）
+_WS_OVERLOADED_CLOSE_CODE = 1013
+# 单个 WebSocket 帧最多合并的消息数
+_WS_BATCH_MAX = 32
+_WS_JSON_OPTS = orjson.OPT_NON_STR_KEYS
+_STATE_JSON_OPTS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+# task_progress 广播中不携带的子任务字段（完整快照见 task["subtasks"]）
+_PROGRESS_OMITTED_SUBTASK_FIELDS = frozenset(("description", "result"))
+
+
+_index_html_cache: tuple[int, bytes] | None = None
+
+
+def _read_index_html() -> bytes:
+    """读取主页 HTML：按 mtime 缓存内容，文件未修改时只需一次 stat"""
+    global _index_html_cache
+    mtime_ns = _INDEX_HTML.stat().st_mtime_ns
+    if _index_html_cache is None or _index_html_cache[0] != mtime_ns:
+        _index_html_cache = (mtime_ns, _INDEX_HTML.read_bytes())
+    return _index_html_cache[1]
+
+
+def _sweep_reports_dir() -> None:
+    """删除 reports/ 下的 md/json/txt 报告文件（单次 scandir，dirent 自带文件类型）"""
+    try:
+        entries = list(os.scandir(_REPORTS_DIR))
+    except OSError:
+        return
+    for entry in entries:
+        if entry.name.endswith(_SWEPT_REPORT_SUFFIXES) and entry.is_file():
+            try:
+                os.unlink(entry.path)
+            except OSError:
+                pass
+
+
+def _write_json_report(path: Path, data: dict) -> None:
+    """同步写出 JSON 报告（调用方在工作线程中执行）"""
+    path.parent.mkdir(exist_ok=True)
+    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def _write_state_file(payload: bytes) -> None:
+    """原子写入状态文件：先写临时文件再 os.replace，崩溃时不会留下半个 JSON"""
+    tmp = _STATE_FILE.with_suffix(_STATE_FILE.suffix + ".tmp")
+    tmp.write_bytes(payload)
+    os.replace(tmp, _STATE_FILE)
+
+
+def _dump_state_json(data: dict) -> bytes:
+    """序列化持久化状态：优先 orjson，不支持的内容（超 64 位整数等）回退标准库 json"""
+    try:
+        return orjson.dumps(data, option=_STATE_JSON_OPTS)
+    except orjson.JSONEncodeError:
+        return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def _extract_json_object(raw_text: str) -> dict[str, Any]:
+    """从 SDK 输出中解析 JSON 对象（兼容代码块包裹和前后说明文字）"""
+    text = (raw_text or "").strip()
+    if not text:
+        raise ValueError("empty sdk output")
+
+    fence_match = _SDK_JSON_FENCE_RE.search(text)
+    if fence_match:
+        text = fence_match.group(1).strip()
+
+    try:
+        parsed = orjson.loads(text)
+        if not isinstance(parsed, dict):
+            raise ValueError("sdk output is not a JSON object")
+        return parsed
+    except Exception:
+        pass
+
+    # 前后夹杂说明文字：取第一个完整的 JSON 对象（正确处理字符串内的花括号）
+    parsed = extract_first_json_object(text)
+    if parsed is None:
+        raise ValueError("json object not found in sdk output")
+    return parsed
+
+
+def _encode_ws_message(event: str, data: dict) -> str:
+    """序列化 WebSocket 推送消息：优先 orjson，不支持的内容（超 64 位整数等）回退标准库 json"""
+    message = {"event": event, "data": data}
+    try:
+        return orjson.dumps(message, option=_WS_JSON_OPTS).decode()
+    except orjson.JSONEncodeError:
+        return json.dumps(message, ensure_ascii=False)
 
 
 def _build_cors_origins() -> list[str]:
@@ -113,18 +215,31 @@ def _build_cors_origins() -> list[str]:
     ]
 
 
+class WSClient:
+    """单个 WebSocket 连接：有界发送队列 + 专属写协程
+
+    broadcast 只负责入队，慢连接的积压被隔离在自己的队列里，不会拖慢其他连接。
+    """
+
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize=_WS_SEND_QUEUE_SIZE)
+        self.writer: Optional[asyncio.Task] = None
+
+
 # 全局状态
 class AppState:
     def __init__(self):
         self.tasks: dict[str, dict] = {}
         self.graph_builder = DynamicGraphBuilder()
         self.discussion_manager = discussion_manager
-        self.active_websockets: list[WebSocket] = []
+        self.ws_clients: set[WSClient] = set()
         self.system_status: str = "idle"
         self.current_node: str = ""
         self.current_task_id: Optional[str] = None
         self.intervention_queues: dict[str, list[str]] = {}
-        self.terminal_log: list[dict] = []
+        # 有界日志：超出 _TERMINAL_LOG_MAX 时自动丢弃最旧的记录
+        self.terminal_log: deque[dict] = deque(maxlen=_TERMINAL_LOG_MAX)
         self.running_task_handles: dict[str, asyncio.Task] = {}
         self.start_lock = asyncio.Lock()
         self.post_init_lock = asyncio.Lock()
@@ -132,13 +247,18 @@ class AppState:
         self.state_lock = asyncio.Lock()
         self.state_rev: int = 0
         self._dirty: bool = False  # 标记是否有未保存的变更
+        self._save_lock = asyncio.Lock()
+        self._last_saved_payload: Optional[bytes] = None  # 上次落盘内容，内容不变时跳过写入
 
     def append_terminal_log(self, entry: dict):
         self.terminal_log.append(entry)
-        if len(self.terminal_log) > 500:
-            self.terminal_log = self.terminal_log[-500:]
         self._dirty = True
 
+    def terminal_log_tail(self, count: int) -> list[dict]:
+        """返回最近 count 条终端日志（按时间顺序）"""
+        start = max(0, len(self.terminal_log) - count)
+        return list(islice(self.terminal_log, start, None))
+
     def mark_dirty(self):
         self._dirty = True
 
@@ -219,31 +339,47 @@ class AppState:
 
         return self._snapshot_state_unlocked()
 
-    def save_to_disk(self):
-        """把核心状态序列化到磁盘"""
-        try:
-            data = {
-                "tasks": self.tasks,
-                "system_status": self.system_status,
-                "current_node": self.current_node,
-                "current_task_id": self.current_task_id,
-                "terminal_log": self.terminal_log[-300:],
-                "state_rev": self.state_rev,
-            }
-            _STATE_FILE.write_text(
-                json.dumps(data, ensure_ascii=False, indent=2),
-                encoding="utf-8",
-            )
-            self._dirty = False
-        except Exception as e:
-            logger.warning("State persist failed: %s", e)
+    def _serialize_state(self) -> bytes:
+        """把核心状态序列化为 JSON 字节（同步执行，不会与事件循环中的状态修改交错）"""
+        return _dump_state_json({
+            "tasks": self.tasks,
+            "system_status": self.system_status,
+            "current_node": self.current_node,
+            "current_task_id": self.current_task_id,
+            "terminal_log": self.terminal_log_tail(300),
+            "state_rev": self.state_rev,
+        })
+
+    async def save_to_disk_async(self):
+        """把核心状态序列化到磁盘：序列化在事件循环内完成，文件写入放到工作线程
+
+        _save_lock 保证多次保存按序落盘，旧快照不会覆盖新快照。
+        """
+        async with self._save_lock:
+            try:
+                payload = self._serialize_state()
+                # 先清标记：写入期间产生的新修改会重新置脏
+                self._dirty = False
+                if payload == self._last_saved_payload:
+                    # 置脏但内容未变（如重复写入相同字段），无需重写文件
+                    return
+                await asyncio.to_thread(_write_state_file, payload)
+                self._last_saved_payload = payload
+            except Exception as e:
+                self._dirty = True
+                logger.warning("State persist failed: %s", e)
 
     def load_from_disk(self):
         """从磁盘恢复状态"""
         if not _STATE_FILE.exists():
             return
         try:
-            data = json.loads(_STATE_FILE.read_text(encoding="utf-8"))
+            raw = _STATE_FILE.read_bytes()
+            try:
+                data = orjson.loads(raw)
+            except orjson.JSONDecodeError:
+                # 旧版本由标准库写出的文件可能含 NaN/Infinity，orjson 不接受
+                data = json.loads(raw)
             self.tasks = data.get("tasks", {})
             self.system_status = data.get("system_status", "idle")
             self.state_rev = int(data.get("state_rev", 0) or 0)
@@ -256,7 +392,7 @@ class AppState:
                 self.system_status = "idle"
             self.current_node = ""
             self.current_task_id = data.get("current_task_id") or None
-            self.terminal_log = data.get("terminal_log", [])
+            self.terminal_log = deque(data.get("terminal_log", []), maxlen=_TERMINAL_LOG_MAX)
             # 注入一条重启提示日志
             self.terminal_log.append({
                 "task_id": "",
@@ -267,15 +403,62 @@ class AppState:
         except Exception as e:
             logger.warning("State load failed: %s", e)
 
+    def add_websocket(self, websocket: WebSocket) -> WSClient:
+        """登记新连接并启动其写协程"""
+        client = WSClient(websocket)
+        client.writer = asyncio.create_task(self._ws_writer(client))
+        self.ws_clients.add(client)
+        return client
+
+    def remove_websocket(self, client: WSClient):
+        """注销连接并停止其写协程（可重复调用）"""
+        self.ws_clients.discard(client)
+        if client.writer and not client.writer.done():
+            client.writer.cancel()
+
+    async def _ws_writer(self, client: WSClient):
+        """按入队顺序把消息写到单个连接，发送失败即注销该连接
+
+        发送期间积压的多条消息合并为一个 JSON 数组帧发出（最多 _WS_BATCH_MAX 条），
+        只有一条时仍按单个对象发送。
+        """
+        queue = client.queue
+        try:
+            while True:
+                messages = [await queue.get()]
+                while len(messages) < _WS_BATCH_MAX and not queue.empty():
+                    messages.append(queue.get_nowait())
+                if len(messages) == 1:
+                    frame = messages[0]
+                else:
+                    # 各消息已是 JSON 文本，直接拼接成数组，无需重新序列化
+                    frame = "[" + ",".join(messages) + "]"
+                await client.websocket.send_text(frame)
+        except asyncio.CancelledError:
+            # 积压被断开的连接：通知客户端稍后重连
+            if client.queue.full():
+                try:
+                    await client.websocket.close(code=_WS_OVERLOADED_CLOSE_CODE)
+                except Exception:
+                    pass
+            raise
+        except Exception:
+            # 写协程自身即将结束，只需从连接表移除
+            self.ws_clients.discard(client)
+
     async def broadcast(self, event: str, data: dict):
-        """广播事件到所有连接的 WebSocket"""
-        message = json.dumps({"event": event, "data": data}, ensure_ascii=False)
-        for ws in self.active_websockets[:]:
+        """广播事件到所有连接的 WebSocket（只入队，实际发送由各连接的写协程完成）"""
+        if not self.ws_clients:
+            # 无连接时不做序列化
+            return
+        # 每个事件只序列化一次，所有连接的队列共享同一个字符串对象
+        message = _encode_ws_message(event, data)
+        for client in list(self.ws_clients):
             try:
-                await ws.send_text(message)
-            except (ConnectionError, RuntimeError, OSError):
-                if ws in self.active_websockets:
-                    self.active_websockets.remove(ws)
+                client.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                logger.warning("WebSocket send queue full, dropping slow client")
+                self.remove_websocket(client)
 
 
 app_state = AppState()
@@ -293,14 +476,15 @@ async def lifespan(app: FastAPI):
         while True:
             await asyncio.sleep(5)
             if app_state._dirty:
-                app_state.save_to_disk()
+                await app_state.save_to_disk_async()
 
     save_task = asyncio.create_task(_periodic_save())
     yield
     # 关闭时保存最终状态
-    app_state.save_to_disk()
+    await app_state.save_to_disk_async()
     save_task.cancel()
-    app_state.active_websockets.clear()
+    for client in list(app_state.ws_clients):
+        app_state.remove_websocket(client)
 
 
 def create_app() -> FastAPI:
@@ -363,9 +547,11 @@ def register_routes(app: FastAPI):
                         "task": task,
                     }
 
+                # 同一次启动的持久化字段与广播共用一个时间戳
+                now_iso = datetime.now().isoformat()
                 task["status"] = "running"
-                task["started_at"] = datetime.now().isoformat()
-                task["updated_at"] = task["started_at"]
+                task["started_at"] = now_iso
+                task["updated_at"] = now_iso
                 task.pop("error", None)
                 task.pop("finished_at", None)
                 snapshot = app_state._set_task_and_system_state_unlocked(
@@ -382,13 +568,13 @@ def register_routes(app: FastAPI):
                 "task_id": task_id,
                 "task": task.get("task", ""),
                 "source": source,
-                "ts": datetime.now().isoformat(),
+                "ts": now_iso,
             })
             await app_state.broadcast("task_started", {
                 "id": task_id,
                 "source": source,
                 "state_rev": snapshot.get("state_rev"),
-                "ts": datetime.now().isoformat(),
+                "ts": now_iso,
             })
 
             handle = _fire(run_task(task_id))
@@ -508,7 +694,7 @@ def register_routes(app: FastAPI):
     @app.get("/", response_class=HTMLResponse)
     async def index():
         """主页"""
-        return FileResponse("src/web/static/index.html")
+        return HTMLResponse(_read_index_html(), headers={"Cache-Control": _INDEX_CACHE_CONTROL})
 
     # ── 任务 API ──
 
@@ -516,33 +702,6 @@ def register_routes(app: FastAPI):
         raw = os.getenv("WEB_TASK_NORMALIZE_ENABLED", "1").strip().lower()
         return raw not in {"0", "false", "off", "no"}
 
-    def _extract_json_object(raw_text: str) -> dict[str, Any]:
-        text = (raw_text or "").strip()
-        if not text:
-            raise ValueError("empty sdk output")
-
-        fence_match = re.search(r"```(?:json)?\s*([\s\S]*?)\s*```", text, flags=re.IGNORECASE)
-        if fence_match:
-            text = fence_match.group(1).strip()
-
-        try:
-            parsed = json.loads(text)
-            if not isinstance(parsed, dict):
-                raise ValueError("sdk output is not a JSON object")
-            return parsed
-        except Exception:
-            pass
-
-        start = text.find("{")
-        end = text.rfind("}")
-        if start < 0 or end <= start:
-            raise ValueError("json object not found in sdk output")
-
-        parsed = json.loads(text[start:end + 1])
-        if not isinstance(parsed, dict):
-            raise ValueError("sdk output is not a JSON object")
-        return parsed
-
     async def _normalize_task_text_via_sdk(raw_task: str) -> dict[str, Any]:
         original = raw_task or ""
         compact = original.strip()
@@ -756,28 +915,24 @@ def register_routes(app: FastAPI):
     @app.post("/api/tasks")
     async def create_task(req: TaskCreate):
         """创建新任务"""
-        import uuid
-        from pathlib import Path as _Path
-        task_id = str(uuid.uuid4())[:8]
-
-        # 清空上一次任务的 reports/ 文件，避免旧报告污染新任务视图
-        _reports_dir = _Path("reports")
-        if _reports_dir.exists():
-            for _f in _reports_dir.iterdir():
-                if _f.is_file() and _f.suffix in (".md", ".json", ".txt"):
-                    try:
-                        _f.unlink()
-                    except Exception:
-                        pass
+        # 8 位十六进制 ID，与原 uuid4 前缀格式一致
+        task_id = secrets.token_hex(4)
+
+        # 清空上一次任务的 reports/ 文件，避免旧报告污染新任务视图（放到工作线程，不阻塞事件循环）
+        await asyncio.to_thread(_sweep_reports_dir)
 
         policy_data = req.execution_policy.model_dump() if req.execution_policy else None
-        normalized_payload = await _normalize_task_text_via_sdk(req.task)
 
+        # 先以原始文本建任务并立即返回；SDK 规范化（最长约 25 秒）在后台完成后回写并自动启动
         task_data = {
             "id": task_id,
-            "task": normalized_payload["normalized_task"],
-            "task_raw": normalized_payload["raw_task"],
-            "task_format_meta": normalized_payload["format_meta"],
+            "task": req.task,
+            "task_raw": req.task,
+            "task_format_meta": {
+                "transformed": False,
+                "reason": "pending",
+                "normalizer": "sdk",
+            },
             "time_minutes": req.time_minutes,
             "execution_policy": policy_data,
             "status": "created",
@@ -795,8 +950,7 @@ def register_routes(app: FastAPI):
 
         await app_state.broadcast("task_created", created_payload)
 
-        # 自动启动：创建后立即触发执行（同步触发，避免依赖前端点击/刷新才看到启动）
-        await _start_task_internal(task_id, source="auto")
+        _fire(_normalize_then_start(task_id, req.task))
 
         return {
             "id": task_id,
@@ -804,6 +958,55 @@ def register_routes(app: FastAPI):
             "state_rev": create_snapshot["state_rev"],
         }
 
+    async def _normalize_then_start(task_id: str, raw_task: str) -> None:
+        """后台规范化任务文本，回写任务后自动启动（避免依赖前端点击/刷新才看到启动）
+
+        后台运行时异常无法再作为 POST 的错误响应返回，因此在此记录日志并广播
+        task_auto_start_failed，任务保持 created，可由前端手动重试启动。
+        """
+        try:
+            normalized_payload = await _normalize_task_text_via_sdk(raw_task)
+
+            async with app_state.state_lock:
+                task = app_state.tasks.get(task_id)
+                if task is None or task.get("status") != "created":
+                    # 规范化期间任务已被删除 / 手动启动 / 取消：不再改写任务文本
+                    return
+                task["task"] = normalized_payload["normalized_task"]
+                task["task_raw"] = normalized_payload["raw_task"]
+                task["task_format_meta"] = normalized_payload["format_meta"]
+                app_state._bump_state_rev_unlocked()
+                app_state.mark_dirty()
+                state_rev = app_state.state_rev
+
+            await app_state.broadcast("task_normalized", {
+                "id": task_id,
+                "task": task["task"],
+                "task_raw": task["task_raw"],
+                "task_format_meta": task["task_format_meta"],
+                "state_rev": state_rev,
+            })
+
+            await _start_task_internal(task_id, source="auto")
+        except HTTPException as e:
+            # 释放锁后任务被清空
+            logger.exception("Auto start failed for task %s: %s", task_id, e.detail)
+            await _broadcast_auto_start_failed(task_id, str(e.detail))
+        except Exception as e:
+            logger.exception("Auto start failed for task %s", task_id)
+            await _broadcast_auto_start_failed(task_id, str(e))
+
+    async def _broadcast_auto_start_failed(task_id: str, error: str) -> None:
+        """通知前端后台自动启动失败；广播本身出错时只记日志，不再向上抛出"""
+        try:
+            await app_state.broadcast("task_auto_start_failed", {
+                "id": task_id,
+                "error": error[:300],
+                "ts": datetime.now().isoformat(),
+            })
+        except Exception:
+            logger.exception("Broadcast task_auto_start_failed failed for task %s", task_id)
+
     def _normalize_assigned_agents(value: Any, specialist_id: Any = None) -> list[str]:
         """标准化 assigned_agents：始终返回 list[str]，并兼容旧 specialist_id。"""
         raw = value
@@ -1008,13 +1211,13 @@ def register_routes(app: FastAPI):
             "id": task_id,
             "previous_status": old_status,
             "state_rev": snapshot.get("state_rev"),
-            "ts": datetime.now().isoformat(),
+            "ts": now_iso,
         })
         await app_state.broadcast("system_status_changed", {
             **snapshot,
             "task_id": task_id,
             "source": "cancel_task",
-            "ts": datetime.now().isoformat(),
+            "ts": now_iso,
         })
         _fire(_start_next_queued_task(
             triggered_by_task_id=task_id,
@@ -1048,7 +1251,8 @@ def register_routes(app: FastAPI):
         # 记录到任务历史
         if "interventions" not in task:
             task["interventions"] = []
-        entry = {"content": req.instruction, "timestamp": datetime.now().isoformat()}
+        now = datetime.now()
+        entry = {"content": req.instruction, "timestamp": now.isoformat()}
         task["interventions"].append(entry)
 
         await app_state.broadcast("task_intervened", {
@@ -1062,7 +1266,7 @@ def register_routes(app: FastAPI):
             "task_id": task_id,
             "line": f"[USER] $ {req.instruction}",
             "level": "input",
-            "ts": datetime.now().strftime("%H:%M:%S"),
+            "ts": now.strftime("%H:%M:%S"),
         }
         app_state.append_terminal_log(terminal_entry)
         await app_state.broadcast("terminal_output", terminal_entry)
@@ -1633,8 +1837,8 @@ def register_routes(app: FastAPI):
                 app_state.terminal_log.clear()
                 app_state._bump_state_rev_unlocked()
                 app_state.mark_dirty()
-                app_state.save_to_disk()
                 snapshot = app_state._snapshot_state_unlocked()
+            await app_state.save_to_disk_async()
 
             await app_state.broadcast("post_init_completed", {
                 "task_id": task_id,
@@ -1821,23 +2025,32 @@ def register_routes(app: FastAPI):
                         if isinstance(s, dict) and s.get("id")
                     }
 
-                    # 广播状态更新
-                    progress_subtasks = _normalize_subtasks_for_api([
+                    # 子任务快照只构建一次：完整版写入 task["subtasks"]，
+                    # 广播用的精简版从中去掉 description/result 得到
+                    update_subtasks = state_update.get("subtasks") or ()
+                    full_subtasks = _normalize_subtasks_for_api([
                         {
                             "id": t.id,
                             "title": t.title,
-                            "status": t.status,
+                            "description": t.description,
                             "agent_type": t.agent_type,
                             "assigned_agents": getattr(t, "assigned_agents", None),
+                            "status": t.status,
+                            "result": t.result,
                             "dependencies": (
                                 getattr(t, "dependencies", None)
                                 or getattr(t, "depends_on", None)
                                 or (existing_subtasks.get(str(t.id), {}).get("dependencies") or [])
                             ),
                         }
-                        for t in state_update.get("subtasks", [])
+                        for t in update_subtasks
                     ])
+                    progress_subtasks = [
+                        {k: v for k, v in st.items() if k not in _PROGRESS_OMITTED_SUBTASK_FIELDS}
+                        for st in full_subtasks
+                    ]
 
+                    # 广播状态更新
                     await app_state.broadcast("task_progress", {
                         "task_id": task_id,
                         "node": node_name,
@@ -1854,23 +2067,7 @@ def register_routes(app: FastAPI):
 
                     # 子任务状态变化时推送名单
                     if "subtasks" in state_update:
-                        task["subtasks"] = _normalize_subtasks_for_api([
-                            {
-                                "id": t.id,
-                                "title": t.title,
-                                "description": t.description,
-                                "agent_type": t.agent_type,
-                                "assigned_agents": getattr(t, "assigned_agents", None),
-                                "status": t.status,
-                                "result": t.result,
-                                "dependencies": (
-                                    getattr(t, "dependencies", None)
-                                    or getattr(t, "depends_on", None)
-                                    or (existing_subtasks.get(str(t.id), {}).get("dependencies") or [])
-                                ),
-                            }
-                            for t in state_update.get("subtasks", [])
-                        ])
+                        task["subtasks"] = full_subtasks
                         app_state.mark_dirty()
                         for t in state_update["subtasks"]:
                             if t.status == "running":
@@ -2172,11 +2369,9 @@ def register_routes(app: FastAPI):
                 "time": now_iso,
             }
 
-            # 保存崩溃报告到 reports/ 目录（规范化）
-            _REPORTS_DIR.mkdir(exist_ok=True)
+            # 保存崩溃报告到 reports/ 目录（规范化）；文件写入放到工作线程，不阻塞事件循环
             crash_report_path = _REPORTS_DIR / "crash_report.json"
-            with open(crash_report_path, "w", encoding="utf-8") as f:
-                json.dump(crash_report, f, indent=2, ensure_ascii=False)
+            await asyncio.to_thread(_write_json_report, crash_report_path, crash_report)
 
             await app_state.broadcast("task_failed", {
                 "id": task_id,
@@ -2231,7 +2426,7 @@ def register_routes(app: FastAPI):
                     triggered_by_task_id=task_id,
                     source="auto_queue_after_finalize",
                 ))
-                app_state.save_to_disk()
+                await app_state.save_to_disk_async()
                 _fire(_schedule_post_task_init(task_id))
 
     # ── Graph API ──
@@ -2458,7 +2653,7 @@ def register_routes(app: FastAPI):
         async with app_state.state_lock:
             response = app_state._snapshot_state_unlocked()
             if include_terminal:
-                response["terminal_log"] = app_state.terminal_log[-200:]
+                response["terminal_log"] = app_state.terminal_log_tail(200)
         return response
 
     # ── 讨论 API ──
@@ -2589,13 +2784,13 @@ def register_routes(app: FastAPI):
     async def websocket_endpoint(websocket: WebSocket):
         """WebSocket 实时通信"""
         await websocket.accept()
-        app_state.active_websockets.append(websocket)
+        client = app_state.add_websocket(websocket)
 
         try:
             while True:
                 data = await websocket.receive_text()
                 try:
-                    message = json.loads(data)
+                    message = orjson.loads(data)
                     if message.get("type") == "terminal_input":
                         task_id = message.get("task_id") or app_state.current_task_id
                         cmd = message.get("command", "").strip()
@@ -2663,11 +2858,12 @@ def register_routes(app: FastAPI):
                         }
                         app_state.append_terminal_log(terminal_entry)
                         await app_state.broadcast("terminal_output", terminal_entry)
-                except json.JSONDecodeError:
+                except orjson.JSONDecodeError:
                     pass
         except WebSocketDisconnect:
-            if websocket in app_state.active_websockets:
-                app_state.active_websockets.remove(websocket)
+            pass
+        finally:
+            app_state.remove_websocket(client)
 
 
 # 创建应用实例
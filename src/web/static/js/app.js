@@ -410,7 +410,12 @@ createApp({
             ws.onclose = () => { wsConnected.value = false; setTimeout(connectWebSocket, 5000); };
             ws.onmessage = (event) => {
                 const data = JSON.parse(event.data);
-                handleWSMessage(data);
+                // 服务端会把积压的多条消息合并为数组帧
+                if (Array.isArray(data)) {
+                    data.forEach(handleWSMessage);
+                } else {
+                    handleWSMessage(data);
+                }
             };
         };
 
@@ -491,6 +496,19 @@ createApp({
                     activeReportContent.value = '';
                     termLog(`⊕ 任务创建: ${payload.id}`, 'info');
                     break;
+                case 'task_normalized': {
+                    if (!shouldApplyStatePayload(payload)) break;
+                    const normalizedTask = tasks.value.find(t => t.id === payload.id);
+                    if (normalizedTask) {
+                        normalizedTask.task = payload.task;
+                        normalizedTask.task_raw = payload.task_raw;
+                        normalizedTask.task_format_meta = payload.task_format_meta;
+                    }
+                    break;
+                }
+                case 'task_auto_start_failed':
+                    termLog(`✗ 任务自动启动失败: ${payload.id} ${payload.error || ''}`, 'error', payload.ts);
+                    break;
                 case 'task_started':
                     if (!shouldApplyStatePayload(payload)) break;
                     mergeTasks([{
@@ -0,0 +1,129 @@
+import asyncio
+import json
+
+import pytest
+
+import src.web.api as api_module
+from src.web.api import AppState
+
+
+class _FakeWebSocket:
+    def __init__(self, delay=0.0, error=None):
+        self.delay = delay
+        self.error = error
+        self.sent = []
+        self.close_codes = []
+
+    async def send_text(self, message):
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        self.sent.append(message)
+
+    async def close(self, code=1000):
+        self.close_codes.append(code)
+
+
+def _received(ws):
+    """展开合并帧，返回按顺序收到的全部消息"""
+    messages = []
+    for frame in ws.sent:
+        parsed = json.loads(frame)
+        messages.extend(parsed if isinstance(parsed, list) else [parsed])
+    return messages
+
+
+@pytest.mark.asyncio
+async def test_broadcast_enqueues_without_waiting_for_slow_clients():
+    state = AppState()
+    fast, slow = _FakeWebSocket(), _FakeWebSocket(delay=0.2)
+    state.add_websocket(fast)
+    state.add_websocket(slow)
+
+    await asyncio.wait_for(state.broadcast("ping", {"msg": "你好"}), timeout=0.05)
+    await state.broadcast("pong", {})
+    await asyncio.sleep(0.5)
+
+    assert [m["event"] for m in _received(slow)] == ["ping", "pong"]
+    assert _received(fast) == _received(slow)
+    assert _received(fast)[0]["data"] == {"msg": "你好"}
+
+
+@pytest.mark.asyncio
+async def test_failed_send_unregisters_client():
+    state = AppState()
+    dead = state.add_websocket(_FakeWebSocket(error=RuntimeError("closed")))
+    alive = state.add_websocket(_FakeWebSocket())
+
+    await state.broadcast("ping", {})
+    await asyncio.sleep(0.05)
+
+    assert state.ws_clients == {alive}
+    assert dead.writer.done()
+
+
+@pytest.mark.asyncio
+async def test_full_queue_disconnects_only_the_slow_client(monkeypatch):
+    monkeypatch.setattr(api_module, "_WS_SEND_QUEUE_SIZE", 2)
+    state = AppState()
+    stuck_ws = _FakeWebSocket(delay=10)
+    stuck = state.add_websocket(stuck_ws)
+    healthy = state.add_websocket(_FakeWebSocket())
+
+    for i in range(4):
+        await state.broadcast("tick", {"i": i})
+        await asyncio.sleep(0.01)
+
+    assert state.ws_clients == {healthy}
+    assert stuck.writer.cancelled()
+    assert stuck_ws.close_codes == [api_module._WS_OVERLOADED_CLOSE_CODE]
+    assert len(_received(healthy.websocket)) == 4
+
+
+@pytest.mark.asyncio
+async def test_broadcast_serializes_once_and_skips_when_no_clients(monkeypatch):
+    dumps_calls = []
+    real_encode = api_module._encode_ws_message
+
+    def _counting_encode(*args):
+        dumps_calls.append(args)
+        return real_encode(*args)
+
+    monkeypatch.setattr(api_module, "_encode_ws_message", _counting_encode)
+    state = AppState()
+
+    await state.broadcast("ping", {"unserializable": object()})
+    assert dumps_calls == []
+
+    first = state.add_websocket(_FakeWebSocket())
+    second = state.add_websocket(_FakeWebSocket())
+    await state.broadcast("ping", {})
+
+    assert len(dumps_calls) == 1
+    assert first.queue.get_nowait() is second.queue.get_nowait()
+
+
+def test_encode_ws_message_matches_stdlib_and_falls_back_for_big_ints():
+    data = {"line": "中文输出", 1: "non-str key"}
+
+    assert json.loads(api_module._encode_ws_message("terminal_output", data)) == {
+        "event": "terminal_output",
+        "data": {"line": "中文输出", "1": "non-str key"},
+    }
+    encoded = api_module._encode_ws_message("big", {"n": 2**70})
+    assert json.loads(encoded)["data"]["n"] == 2**70
+
+
+@pytest.mark.asyncio
+async def test_backlog_is_sent_as_one_array_frame():
+    state = AppState()
+    slow_ws = _FakeWebSocket(delay=0.1)
+    state.add_websocket(slow_ws)
+
+    for i in range(3):
+        await state.broadcast("tick", {"i": i})
+        await asyncio.sleep(0)
+    await asyncio.sleep(0.3)
+
+    assert json.loads(slow_ws.sent[0]) == {"event": "tick", "data": {"i": 0}}
+    assert [m["data"]["i"] for m in json.loads(slow_ws.sent[1])] == [1, 2]
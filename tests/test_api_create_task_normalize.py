@@ -0,0 +1,114 @@
+import asyncio
+import json
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+import src.web.api as api_module
+from src.agents.sdk_executor import SubagentResult
+
+
+class _SlowNormalizer:
+    def __init__(self):
+        self.release = asyncio.Event()
+
+    async def execute(self, **kwargs):
+        await self.release.wait()
+        payload = {"normalized_task": "## 目标\n整理后的任务", "transformed": True}
+        return SubagentResult(success=True, result=json.dumps(payload, ensure_ascii=False))
+
+
+@pytest.mark.asyncio
+async def test_create_task_returns_before_normalization_then_starts(monkeypatch, tmp_path):
+    monkeypatch.setenv("WEB_TASK_NORMALIZE_ENABLED", "1")
+    monkeypatch.setattr(api_module, "_REPORTS_DIR", tmp_path / "reports")
+    normalizer = _SlowNormalizer()
+    monkeypatch.setattr(api_module, "get_executor", lambda: normalizer)
+
+    fired = []
+
+    def _fire_normalize_only(coro):
+        if coro.cr_code.co_name == "_normalize_then_start":
+            task = asyncio.create_task(coro)
+            fired.append(task)
+            return task
+        coro.close()
+        return None
+
+    events = []
+
+    async def _capture_broadcast(event, payload):
+        events.append(event)
+
+    monkeypatch.setattr(api_module, "_fire", _fire_normalize_only)
+    monkeypatch.setattr(api_module.app_state, "broadcast", _capture_broadcast)
+    api_module.app_state.tasks.clear()
+    api_module.app_state.running_task_handles.clear()
+    api_module.app_state.current_task_id = None
+    api_module.app_state.system_status = "idle"
+
+    transport = ASGITransport(app=api_module.app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await asyncio.wait_for(client.post("/api/tasks", json={"task": "原始任务"}), timeout=2)
+
+    assert resp.status_code == 200
+    task = api_module.app_state.tasks[resp.json()["id"]]
+    assert task["task"] == "原始任务"
+    assert task["status"] == "created"
+    assert task["task_format_meta"]["reason"] == "pending"
+
+    normalizer.release.set()
+    await fired[0]
+
+    assert task["task"] == "## 目标\n整理后的任务"
+    assert task["task_raw"] == "原始任务"
+    assert task["status"] == "running"
+    assert events.index("task_normalized") < events.index("task_started")
+
+
+@pytest.mark.asyncio
+async def test_normalize_then_start_reports_auto_start_failure(monkeypatch, tmp_path, caplog):
+    monkeypatch.setenv("WEB_TASK_NORMALIZE_ENABLED", "1")
+    monkeypatch.setattr(api_module, "_REPORTS_DIR", tmp_path / "reports")
+    normalizer = _SlowNormalizer()
+    normalizer.release.set()
+    monkeypatch.setattr(api_module, "get_executor", lambda: normalizer)
+
+    fired = []
+
+    def _fire_normalize_only(coro):
+        if coro.cr_code.co_name == "_normalize_then_start":
+            task = asyncio.create_task(coro)
+            fired.append(task)
+            return task
+        coro.close()
+        return None
+
+    events = []
+
+    async def _capture_broadcast(event, payload):
+        events.append((event, payload))
+        if event == "task_normalized":
+            raise RuntimeError("broadcast boom")
+
+    monkeypatch.setattr(api_module, "_fire", _fire_normalize_only)
+    monkeypatch.setattr(api_module.app_state, "broadcast", _capture_broadcast)
+    api_module.app_state.tasks.clear()
+    api_module.app_state.running_task_handles.clear()
+    api_module.app_state.current_task_id = None
+    api_module.app_state.system_status = "idle"
+
+    transport = ASGITransport(app=api_module.app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.post("/api/tasks", json={"task": "原始任务"})
+
+    task_id = resp.json()["id"]
+    with caplog.at_level("ERROR"):
+        await fired[0]
+
+    assert fired[0].exception() is None
+    failed = [payload for event, payload in events if event == "task_auto_start_failed"]
+    assert failed and failed[0]["id"] == task_id
+    assert "broadcast boom" in failed[0]["error"]
+    assert any("Auto start failed" in r.getMessage() for r in caplog.records)
+    assert api_module.app_state.tasks[task_id]["status"] == "created"
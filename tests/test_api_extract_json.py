@@ -0,0 +1,20 @@
+import pytest
+
+from src.web.api import _extract_json_object
+
+
+def test_extract_json_object_handles_fences_and_surrounding_text():
+    assert _extract_json_object('```json\n{"normalized_task": "a"}\n```') == {"normalized_task": "a"}
+    assert _extract_json_object('结果如下：{"normalized_task": "b"} 以上') == {"normalized_task": "b"}
+
+
+def test_extract_json_object_stops_at_first_balanced_object():
+    text = 'note {"normalized_task": "uses } inside"} trailing {"other": 1}'
+
+    assert _extract_json_object(text) == {"normalized_task": "uses } inside"}
+
+
+@pytest.mark.parametrize("text", ["", "no json here", "{broken"])
+def test_extract_json_object_rejects_missing_object(text):
+    with pytest.raises(ValueError):
+        _extract_json_object(text)
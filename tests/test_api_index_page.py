@@ -0,0 +1,26 @@
+import os
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+import src.web.api as api_module
+
+
+@pytest.mark.asyncio
+async def test_index_served_from_cache_and_reloaded_after_edit(tmp_path, monkeypatch):
+    index = tmp_path / "index.html"
+    index.write_text("<html>v1</html>", encoding="utf-8")
+    monkeypatch.setattr(api_module, "_INDEX_HTML", index)
+    monkeypatch.setattr(api_module, "_index_html_cache", None)
+
+    transport = ASGITransport(app=api_module.app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        first = await client.get("/")
+        assert first.text == "<html>v1</html>"
+        assert first.headers["content-type"].startswith("text/html")
+        assert first.headers["cache-control"] == api_module._INDEX_CACHE_CONTROL
+
+        index.write_text("<html>v2</html>", encoding="utf-8")
+        stat = index.stat()
+        os.utime(index, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert (await client.get("/")).text == "<html>v2</html>"
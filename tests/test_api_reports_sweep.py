@@ -0,0 +1,19 @@
+import src.web.api as api_module
+
+
+def test_sweep_reports_dir_removes_only_report_files(tmp_path, monkeypatch):
+    reports = tmp_path / "reports"
+    (reports / "nested").mkdir(parents=True)
+    for name in ("a.md", "b.json", "c.txt", "keep.png"):
+        (reports / name).write_text("x", encoding="utf-8")
+    monkeypatch.setattr(api_module, "_REPORTS_DIR", reports)
+
+    api_module._sweep_reports_dir()
+
+    assert sorted(p.name for p in reports.iterdir()) == ["keep.png", "nested"]
+
+
+def test_sweep_reports_dir_ignores_missing_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(api_module, "_REPORTS_DIR", tmp_path / "missing")
+
+    api_module._sweep_reports_dir()
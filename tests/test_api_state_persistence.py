@@ -0,0 +1,88 @@
+import asyncio
+import json
+
+import pytest
+
+import src.web.api as api_module
+from src.web.api import AppState
+
+
+@pytest.mark.asyncio
+async def test_state_round_trips_through_disk(tmp_path, monkeypatch):
+    state_file = tmp_path / "app_state.json"
+    monkeypatch.setattr(api_module, "_STATE_FILE", state_file)
+    state = AppState()
+    state.tasks = {"t1": {"id": "t1", "status": "done", "task": "中文任务", "big": 2**70}}
+    state.append_terminal_log({"task_id": "t1", "line": "完成", "level": "info", "ts": "10:00:00"})
+    state.state_rev = 3
+
+    await state.save_to_disk_async()
+
+    assert "中文任务" in state_file.read_text(encoding="utf-8")
+    restored = AppState()
+    restored.load_from_disk()
+    assert restored.tasks == state.tasks
+    assert restored.state_rev == 3
+    assert restored.terminal_log[0]["line"] == "完成"
+
+
+def test_load_accepts_legacy_stdlib_json_with_nan(tmp_path, monkeypatch):
+    state_file = tmp_path / "app_state.json"
+    state_file.write_text(json.dumps({"tasks": {"t1": {"score": float("nan")}}}), encoding="utf-8")
+    monkeypatch.setattr(api_module, "_STATE_FILE", state_file)
+
+    state = AppState()
+    state.load_from_disk()
+
+    assert list(state.tasks) == ["t1"]
+
+
+@pytest.mark.asyncio
+async def test_async_save_writes_atomically_and_keeps_later_changes_dirty(tmp_path, monkeypatch):
+    state_file = tmp_path / "app_state.json"
+    monkeypatch.setattr(api_module, "_STATE_FILE", state_file)
+    state = AppState()
+    state.tasks = {"t1": {"id": "t1"}}
+    state.mark_dirty()
+
+    save = asyncio.create_task(state.save_to_disk_async())
+    await asyncio.sleep(0)
+    state.tasks["t2"] = {"id": "t2"}
+    state.mark_dirty()
+    await save
+
+    assert list(json.loads(state_file.read_text(encoding="utf-8"))["tasks"]) == ["t1"]
+    assert state._dirty
+    assert [p.name for p in tmp_path.iterdir()] == ["app_state.json"]
+
+
+def test_terminal_log_is_bounded_and_tail_keeps_order():
+    state = AppState()
+    for i in range(api_module._TERMINAL_LOG_MAX + 10):
+        state.append_terminal_log({"line": str(i)})
+
+    assert len(state.terminal_log) == api_module._TERMINAL_LOG_MAX
+    assert state.terminal_log[0]["line"] == "10"
+    assert [e["line"] for e in state.terminal_log_tail(3)] == ["507", "508", "509"]
+    assert len(state.terminal_log_tail(1000)) == api_module._TERMINAL_LOG_MAX
+
+
+@pytest.mark.asyncio
+async def test_async_save_skips_rewrite_when_content_unchanged(tmp_path, monkeypatch):
+    state_file = tmp_path / "app_state.json"
+    monkeypatch.setattr(api_module, "_STATE_FILE", state_file)
+    writes = []
+    real_write = api_module._write_state_file
+    monkeypatch.setattr(api_module, "_write_state_file", lambda payload: (writes.append(payload), real_write(payload)))
+    state = AppState()
+    state.tasks = {"t1": {"id": "t1"}}
+
+    await state.save_to_disk_async()
+    state.mark_dirty()
+    await state.save_to_disk_async()
+    assert len(writes) == 1
+    assert not state._dirty
+
+    state.tasks["t1"]["status"] = "done"
+    await state.save_to_disk_async()
+    assert len(writes) == 2
@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+from src.agents.caller import SubagentCaller
+from src.agents.pool_registry import SubagentTemplate
+from src.agents.sdk_executor import SubagentResult
+from src.agents.subagent_manager import SubagentState
+
+
+class _ReadyManager:
+    def get_state(self, agent_id):
+        return SubagentState.READY
+
+    def mark_in_use(self, agent_id):
+        return None
+
+
+class _Pool:
+    def get_template(self, agent_id):
+        return SubagentTemplate(
+            file_path=f"{agent_id}.md",
+            name=agent_id,
+            description="test agent",
+            content="system prompt",
+        )
+
+
+class _ScriptedExecutor:
+    """按顺序执行脚本：'hang' 模拟卡住，其余为 SubagentResult"""
+
+    def __init__(self, script):
+        self.script = list(script)
+        self.calls = []
+
+    async def execute(self, **kwargs):
+        self.calls.append(kwargs)
+        step = self.script.pop(0)
+        if step == "hang":
+            await asyncio.sleep(10)
+        return step
+
+
+def _caller(executor):
+    return SubagentCaller(manager=_ReadyManager(), pool=_Pool(), executor=executor)
+
+
+@pytest.mark.asyncio
+async def test_call_retries_after_timeout_and_succeeds():
+    executor = _ScriptedExecutor(["hang", SubagentResult(success=True, result="ok", turns=2)])
+
+    out = await _caller(executor).call("reflector", {}, timeout=0.05, max_retries=1)
+
+    assert out["success"] is True
+    assert out["result"] == "ok"
+    assert len(executor.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_call_reports_timeout_when_retries_exhausted():
+    executor = _ScriptedExecutor(["hang", "hang"])
+
+    out = await _caller(executor).call("reflector", {}, timeout=0.05, max_retries=1)
+
+    assert out["success"] is False
+    assert "超时" in out["error"]
+    assert out["result"] is None
+    assert len(executor.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_call_defaults_keep_single_unbounded_attempt():
+    executor = _ScriptedExecutor([SubagentResult(success=False, error="boom")])
+
+    out = await _caller(executor).call("reviewer", {})
+
+    assert out == {"success": False, "error": "boom", "result": None}
+    assert len(executor.calls) == 1
+    assert "max_turns" not in executor.calls[0]
+
@@ -0,0 +1,60 @@
+import json
+import threading
+import time
+
+from src.utils.claude_communication import get_decision_result, report_stuck
+
+
+def test_get_decision_result_picks_up_file_before_first_full_interval(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    result_path = tmp_path / "decision_result.json"
+
+    def write_later():
+        time.sleep(0.2)
+        result_path.write_text(json.dumps({"choice": "A"}), encoding="utf-8")
+
+    writer = threading.Thread(target=write_later)
+    writer.start()
+    started = time.monotonic()
+    result = get_decision_result(timeout=5, poll_interval=5)
+    writer.join()
+
+    assert result == {"choice": "A"}
+    assert time.monotonic() - started < 2
+    assert not result_path.exists()
+
+
+def test_get_decision_result_honours_timeout(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    started = time.monotonic()
+    assert get_decision_result(timeout=0.3, poll_interval=5) is None
+    assert time.monotonic() - started < 1
+
+
+def test_get_decision_result_retries_torn_result_file(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    result_path = tmp_path / "decision_result.json"
+    result_path.write_text('{"choice": ', encoding="utf-8")
+
+    def finish_later():
+        time.sleep(0.2)
+        result_path.write_text(json.dumps({"choice": "B"}), encoding="utf-8")
+
+    writer = threading.Thread(target=finish_later)
+    writer.start()
+    result = get_decision_result(timeout=5, poll_interval=0.1)
+    writer.join()
+
+    assert result == {"choice": "B"}
+
+
+def test_report_stuck_writes_utf8_json_without_leftover_tmp(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    name = report_stuck("executor", {"phase": "执行"}, [], "卡住")
+
+    text = (tmp_path / name).read_text(encoding="utf-8")
+    assert "卡住" in text
+    assert json.loads(text)["state"] == {"phase": "执行"}
+    assert list(tmp_path.iterdir()) == [tmp_path / name]
@@ -0,0 +1,14 @@
+from src.utils.config import get_config
+
+
+def test_get_config_is_cached_until_cache_clear(monkeypatch):
+    get_config.cache_clear()
+    monkeypatch.setenv("MAX_RETRIES", "5")
+    first = get_config()
+
+    monkeypatch.setenv("MAX_RETRIES", "9")
+    assert get_config() is first
+
+    get_config.cache_clear()
+    assert get_config().max_retries == 9
+    get_config.cache_clear()
@@ -0,0 +1,24 @@
+from src.graph.dynamic_builder import DynamicGraphBuilder
+
+
+async def _noop(state):
+    return {}
+
+
+def test_to_dict_is_cached_until_graph_changes():
+    builder = DynamicGraphBuilder()
+    builder.add_node("a", "A", _noop)
+
+    first = builder.to_dict()
+    assert builder.to_dict() is first
+
+    builder.update_node_status("a", "running")
+    second = builder.to_dict()
+    assert second is not first
+    assert second["nodes"][0]["status"] == "running"
+
+    builder.add_node("b", "B", _noop)
+    builder.add_edge("a", "b")
+    third = builder.to_dict()
+    assert [n["id"] for n in third["nodes"]] == ["a", "b"]
+    assert "a --> b" in third["mermaid"]
@@ -0,0 +1,27 @@
+from src.graph.utils.json_parser import (
+    extract_first_json_array,
+    extract_first_json_object,
+    safe_parse_json,
+)
+
+
+def test_extract_object_ignores_braces_and_quotes_inside_strings():
+    text = 'verdict: {"score": 8, "issues": ["missing } brace", "say \\"{hi\\""]} then {"score": 1}'
+
+    assert extract_first_json_object(text) == {
+        "score": 8,
+        "issues": ["missing } brace", 'say "{hi"'],
+    }
+
+
+def test_extract_object_skips_invalid_candidates_and_fences():
+    assert extract_first_json_object("{not json} ```json\n{\"a\": {\"b\": 2}}\n```") == {"a": {"b": 2}}
+    assert extract_first_json_object("no json here") is None
+    assert extract_first_json_object("") is None
+
+
+def test_extract_array_and_safe_parse():
+    assert extract_first_json_array('items: ["a]", 2] and [3]') == ["a]", 2]
+    assert safe_parse_json("```json\n[1, 2]\n```") == [1, 2]
+    assert safe_parse_json('prefix {"ok": true} suffix') == {"ok": True}
+    assert safe_parse_json("[" * 1200) is None
@@ -0,0 +1,29 @@
+import logging
+
+from src.utils import logger as logger_module
+
+
+def test_setup_logging_writes_file_through_background_listener(tmp_path, monkeypatch):
+    root = logging.getLogger()
+    monkeypatch.setattr(root, "handlers", [])
+    monkeypatch.setattr(logger_module, "_configured", False)
+    monkeypatch.setattr(logger_module, "_listener", None)
+    level = root.level
+    log_file = tmp_path / "logs" / "app.log"
+
+    try:
+        logger_module.setup_logging(log_file=str(log_file))
+        assert [type(h) for h in root.handlers] == [logging.handlers.QueueHandler]
+
+        listener = logger_module._listener
+        logging.getLogger("test.logger").warning("写入 %s", "文件")
+        logger_module._stop_listener()
+    finally:
+        logger_module._stop_listener()
+        for handler in listener.handlers:
+            handler.close()
+        root.setLevel(level)
+
+    lines = log_file.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 1
+    assert lines[0].endswith("| WARNING  | test.logger | 写入 文件")
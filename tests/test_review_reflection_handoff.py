@@ -0,0 +1,150 @@
+import asyncio
+import json
+
+import pytest
+
+from src.graph.nodes import reflector_v2, reviewer_v2
+from src.graph.state import SubTask
+
+
+class _Pool:
+    def get_template(self, agent_id):
+        return None
+
+
+class _FakeCaller:
+    def __init__(self):
+        self.calls = []
+
+    async def call(self, agent_id, context, **kwargs):
+        self.calls.append(agent_id)
+        if agent_id.startswith("reviewer"):
+            payload = {"verdict": "REVISE", "score": 4, "issues": ["缺少单元测试"], "suggestions": ["补测试"]}
+        else:
+            payload = {"root_cause": "未覆盖边界", "lessons_learned": [], "improvements": ["补测试"]}
+        return {"success": True, "result": json.dumps(payload, ensure_ascii=False)}
+
+
+@pytest.mark.asyncio
+async def test_reviewer_v2_log_feeds_reflector_v2_issues(monkeypatch):
+    caller = _FakeCaller()
+    monkeypatch.setattr(reviewer_v2, "get_pool", lambda: _Pool())
+    monkeypatch.setattr(reflector_v2, "get_pool", lambda: _Pool())
+    monkeypatch.setattr(reviewer_v2, "get_caller", lambda: caller)
+    monkeypatch.setattr(reflector_v2, "get_caller", lambda: caller)
+
+    task = SubTask(
+        id="task-001",
+        title="实现功能",
+        description="desc",
+        agent_type="coder",
+        status="running",
+        result="some result",
+    )
+    state = {"subtasks": [task], "current_subtask_id": task.id, "execution_log": []}
+
+    review_patch = await reviewer_v2.reviewer_v2_node(state)
+    review_log = review_patch["execution_log"][0]
+    assert review_log["event"] == "multi_review_complete"
+    assert review_log["issues"] == ["缺少单元测试"]
+
+    state = {
+        **state,
+        "subtasks": review_patch["subtasks"],
+        "execution_log": state["execution_log"] + review_patch["execution_log"],
+    }
+    caller.calls.clear()
+
+    reflect_patch = await reflector_v2.reflector_v2_node(state)
+
+    assert caller.calls == ["reflector"] * len(reflector_v2.REFLECTION_PERSPECTIVES)
+    assert reflect_patch["execution_log"][0]["event"] == "multi_reflection_complete"
+
+
+def test_parse_review_result_ignores_braces_inside_strings():
+    parsed = reviewer_v2._parse_review_result(
+        'review: {"score": 8, "issues": ["missing } brace"]} trailing {"score": 1}'
+    )
+
+    assert parsed["score"] == 8
+    assert parsed["issues"] == ["missing } brace"]
+    assert reviewer_v2._parse_review_result("{bad} then no json") is None
+
+
+class _SlowThirdReviewerPool:
+    def get_template(self, agent_id):
+        return agent_id if agent_id.startswith("reviewer_") else None
+
+
+@pytest.mark.asyncio
+async def test_parallel_review_stops_once_revise_is_decided(monkeypatch):
+    monkeypatch.setattr(reviewer_v2, "get_pool", lambda: _SlowThirdReviewerPool())
+    cancelled = []
+
+    class _Caller:
+        async def call(self, agent_id, context, **kwargs):
+            if agent_id == "reviewer_3":
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.append(agent_id)
+                    raise
+            return {"success": True, "result": '{"verdict": "REVISE", "score": 5}'}
+
+    task = SubTask(id="task-001", title="t", description="d", agent_type="coder", result="r")
+
+    reviews = await asyncio.wait_for(reviewer_v2._parallel_review(_Caller(), task), timeout=1)
+    await asyncio.sleep(0)
+
+    assert [r["verdict"] for r in reviews] == ["REVISE", "REVISE"]
+    assert cancelled == ["reviewer_3"]
+
+
+def test_revise_is_decided_only_when_pass_cannot_win():
+    passed, revised = {"verdict": "PASS"}, {"verdict": "REVISE"}
+
+    assert reviewer_v2._revise_is_decided([revised, revised], pending=1)
+    assert not reviewer_v2._revise_is_decided([passed, revised], pending=1)
+    assert not reviewer_v2._revise_is_decided([passed, passed], pending=1)
+    assert not reviewer_v2._revise_is_decided([revised], pending=2)
+
+
+def test_merge_feedback_dedups_issues_and_suggestions_independently():
+    reviews = [
+        {"issues": ["Missing tests ", "same"], "suggestions": ["same"]},
+        {"issues": [" missing TESTS", "new"], "suggestions": ["Same", "other"]},
+    ]
+
+    issues, suggestions = reviewer_v2._merge_feedback(reviews)
+
+    assert issues == ["Missing tests ", "same", "new"]
+    assert suggestions == ["same", "other"]
+
+
+@pytest.mark.asyncio
+async def test_review_discussion_skipped_when_reviewers_agree(monkeypatch):
+    created = []
+    monkeypatch.setattr(reviewer_v2.discussion_manager, "create_discussion", created.append)
+    task = SubTask(id="task-001", title="t", description="d", agent_type="coder")
+    reviews = [{"verdict": "REVISE", "score": 4}, {"verdict": "REVISE", "score": 5}]
+
+    await reviewer_v2._discuss_review_disagreement("review_agree", reviews, task, [4, 5])
+
+    assert created == []
+
+
+@pytest.mark.asyncio
+async def test_review_discussion_posts_opinions_then_alert_in_order():
+    from src.discussion.manager import discussion_manager
+
+    task = SubTask(id="task-001", title="t", description="d", agent_type="coder")
+    reviews = [
+        {"verdict": "PASS", "score": 9, "issues": []},
+        {"verdict": "REVISE", "score": 3, "issues": ["缺少测试"]},
+    ]
+
+    await reviewer_v2._discuss_review_disagreement("review_split", reviews, task, [9, 3])
+
+    messages = discussion_manager.get_discussion("review_split").messages
+    assert [m.from_agent for m in messages] == ["reviewer_1", "reviewer_2", "review_coordinator"]
+    assert json.loads(messages[1].content)["key_issues"] == ["缺少测试"]
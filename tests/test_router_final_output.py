@@ -0,0 +1,117 @@
+import json
+import os
+
+import pytest
+
+from src.graph.state import SubTask
+import src.graph.nodes.router as router_module
+from src.graph.nodes.router import _build_final_output
+
+
+def _task(task_id: str, status: str = "done", result: str | None = "ok") -> SubTask:
+    return SubTask(
+        id=task_id,
+        title=f"title-{task_id}",
+        description="desc",
+        agent_type="coder",
+        status=status,
+        result=result,
+    )
+
+
+def test_final_output_uses_indexed_artifacts(tmp_path, monkeypatch):
+    monkeypatch.setattr(router_module, "_REPORTS_DIR", tmp_path / "missing")
+    md_path = tmp_path / "task-001.md"
+    md_path.write_text("# 报告 A", encoding="utf-8")
+    json_path = tmp_path / "task-002.json"
+    json_path.write_text(json.dumps({"ok": True, "说明": "中文"}, ensure_ascii=False), encoding="utf-8")
+
+    state = {
+        "subtasks": [_task("task-001"), _task("task-002", status="failed", result=None)],
+        "artifacts": {"task-001": str(md_path), "task-002:json": str(json_path)},
+    }
+
+    output = _build_final_output(state)
+
+    assert "### ✅ title-task-001" in output
+    assert "### ❌ title-task-002" in output
+    assert "## 📁 详细分析报告" in output
+    assert "### task-001\n" in output and "# 报告 A" in output
+    assert '```json\n{\n  "ok": true,\n  "说明": "中文"\n}\n```' in output
+
+
+def test_final_output_falls_back_to_reports_dir_in_mtime_order(tmp_path, monkeypatch):
+    monkeypatch.setattr(router_module, "_REPORTS_DIR", tmp_path)
+    older = tmp_path / "older.md"
+    newer = tmp_path / "newer.md"
+    data = tmp_path / "data.json"
+    broken = tmp_path / "broken.json"
+    older.write_text("older body", encoding="utf-8")
+    newer.write_text("newer body", encoding="utf-8")
+    data.write_text('{"k": 1}', encoding="utf-8")
+    broken.write_text("{not json", encoding="utf-8")
+    os.utime(older, (1_000, 1_000))
+    os.utime(newer, (2_000, 2_000))
+
+    state = {"subtasks": [_task("task-001")], "artifacts": {}}
+
+    output = _build_final_output(state)
+
+    assert output.index("### older") < output.index("### newer")
+    assert '### data\n\n```json\n{\n  "k": 1\n}\n```' in output
+    assert "### broken" not in output
+
+
+def test_final_output_without_reports(tmp_path, monkeypatch):
+    monkeypatch.setattr(router_module, "_REPORTS_DIR", tmp_path / "missing")
+    state = {"subtasks": [_task("task-001", status="pending", result=None)]}
+
+    output = _build_final_output(state)
+
+    assert output.startswith("✅ **所有任务已完成：**\n")
+    assert "### ⏳ title-task-001" in output
+    assert "详细分析报告" not in output
+
+
+def test_final_output_keeps_reports_orjson_rejects(tmp_path, monkeypatch):
+    monkeypatch.setattr(router_module, "_REPORTS_DIR", tmp_path)
+    (tmp_path / "latin.json").write_bytes(b'{"name": "caf\xe9"}')
+    (tmp_path / "nan.json").write_text('{"score": NaN}', encoding="utf-8")
+
+    output = _build_final_output({"subtasks": [_task("task-001")], "artifacts": {}})
+
+    assert '"name": "caf\ufffd"' in output
+    assert '"score": NaN' in output
+
+
+@pytest.mark.asyncio
+async def test_router_node_builds_final_output_when_all_terminal(tmp_path, monkeypatch):
+    monkeypatch.setattr(router_module, "_REPORTS_DIR", tmp_path)
+    (tmp_path / "summary.md").write_text("report body", encoding="utf-8")
+    state = {"subtasks": [_task("task-001"), _task("task-002", status="skipped", result=None)]}
+
+    patch = await router_module.router_node(state)
+
+    assert patch["phase"] == "complete"
+    assert "### ✅ title-task-001" in patch["final_output"]
+    assert "report body" in patch["final_output"]
+
+
+@pytest.mark.asyncio
+async def test_router_node_strict_policy_blocks_completion_on_failed_subtask():
+    state = {
+        "subtasks": [_task("task-001"), _task("task-002", status="failed", result=None)],
+        "execution_policy": {"strict_enforcement": True},
+        "phase": "reviewing",
+    }
+
+    patch = await router_module.router_node(state)
+
+    assert patch["phase"] == "reviewing"
+    assert patch["stalled_event"]["reason"] == "strict_execution_failed"
+
+    state["subtasks"].append(_task("task-003", status="pending", result=None))
+    patch = await router_module.router_node(state)
+
+    assert patch["phase"] == "reviewing"
+    assert "stalled_event" not in patch
@@ -0,0 +1,57 @@
+from src.graph.state import SubTask
+from src.graph.utils.subtask_index import build_subtask_index, find_subtask, replace_subtask
+
+
+def _task(task_id: str, status: str = "pending") -> SubTask:
+    return SubTask(
+        id=task_id,
+        title=f"title-{task_id}",
+        description="desc",
+        agent_type="coder",
+        status=status,
+    )
+
+
+def test_find_subtask_uses_index_hit():
+    subtasks = [_task("task-001"), _task("task-002"), _task("task-003")]
+    index = build_subtask_index(subtasks)
+
+    assert index == {"task-001": 0, "task-002": 1, "task-003": 2}
+    assert find_subtask(subtasks, "task-002", index) is subtasks[1]
+
+
+def test_find_subtask_stale_index_falls_back_to_scan():
+    subtasks = [_task("task-001"), _task("task-002")]
+    stale_index = build_subtask_index(list(reversed(subtasks)))
+
+    assert find_subtask(subtasks, "task-001", stale_index) is subtasks[0]
+    assert find_subtask(subtasks, "task-002", {"task-002": 9}) is subtasks[1]
+
+
+def test_find_subtask_without_index_or_missing_id():
+    subtasks = [_task("task-001")]
+
+    assert find_subtask(subtasks, "task-001") is subtasks[0]
+    assert find_subtask(subtasks, "task-404", build_subtask_index(subtasks)) is None
+    assert find_subtask(subtasks, None) is None
+
+
+def test_duplicate_ids_resolve_to_first_like_linear_scan():
+    subtasks = [_task("task-001", "pending"), _task("task-001", "done")]
+    index = build_subtask_index(subtasks)
+
+    assert index == {"task-001": 0}
+    assert find_subtask(subtasks, "task-001", index) is subtasks[0]
+    assert find_subtask(subtasks, "task-001") is subtasks[0]
+
+
+def test_replace_subtask_swaps_only_target_position():
+    subtasks = [_task("task-001"), _task("task-002"), _task("task-003")]
+    new = subtasks[1].model_copy(update={"status": "done"})
+
+    updated = replace_subtask(subtasks, new, {"task-002": 0})
+
+    assert updated == [subtasks[0], new, subtasks[2]]
+    assert updated[0] is subtasks[0] and updated[2] is subtasks[2]
+    assert subtasks[1].status == "pending"
+    assert replace_subtask(subtasks, _task("task-404")) == subtasks